@@ -3,47 +3,146 @@ import time
 import uuid
 import os
 import subprocess
-from picamera2 import Picamera2
+import shutil
+import atexit
+import hashlib
+import threading
+import argparse
+import io
+import sys
+import queue
+import selectors
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# TTS 라이브러리 (gTTS 사용)
-try:
-    from gtts import gTTS
-    TTS_AVAILABLE = True
-except ImportError:
-    print("[경고] gTTS가 설치되지 않았습니다. pip install gtts 로 설치하세요.")
-    TTS_AVAILABLE = False
+from result_text import build_oled_result_lines, build_speech_text
+
+# gTTS / pyttsx3 / luma.oled / Picamera2는 무거우므로 실제로 쓸 때 불러옴
+# (init_tts(), init_oled(), get_camera() 참고)
+gTTS = None
+TTS_AVAILABLE = False
+OFFLINE_TTS_ENGINE = None
+OLED_AVAILABLE = False
 
-# OLED 디스플레이 (luma.oled 사용)
+# 스트리밍 업로드 (requests-toolbelt 사용)
 try:
-    from luma.core.interface.serial import i2c
-    from luma.oled.device import ssd1306, sh1106
-    from luma.core.render import canvas
-    from PIL import ImageFont
-    OLED_AVAILABLE = True
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+    STREAM_UPLOAD_AVAILABLE = True
 except ImportError:
-    print("[경고] luma.oled가 설치되지 않았습니다. pip install luma.oled 로 설치하세요.")
-    OLED_AVAILABLE = False
+    print("[경고] requests-toolbelt가 설치되지 않았습니다. pip install requests-toolbelt 로 설치하세요.")
+    STREAM_UPLOAD_AVAILABLE = False
 
 # 서버 주소 (필요하면 IP로 바꿔라)
 SERVER_URL = "http://127.0.0.1:5000/api/upload"
+# 연결 예열용 주소 (/api/upload 는 POST 전용이라 HEAD 를 보내면 405)
+HEALTH_URL = SERVER_URL.rsplit("/api/", 1)[0] + "/health"
 
-# 저장될 임시 파일 경로
-TEMP_DIR = "/home/pi/label_temp"
-os.makedirs(TEMP_DIR, exist_ok=True)
+# 서버 연결 재사용 (keep-alive) 및 백그라운드 업로드
+SESSION = requests.Session()
+EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# 업로드 스레드 → 메인 스레드로 보내는 화면 갱신 요청 (함수, 인자)
+UI_QUEUE = queue.Queue()
 
 # TTS 음성 파일 경로
 TTS_FILE = "/tmp/tts_output.mp3"
+TTS_WAV_FILE = "/tmp/tts_output.wav"
+
+# 음성 플레이어는 시작할 때 한 번만 확인
+# (mp3 플레이어가 없으면 ffmpeg로 wav 변환 후 aplay 사용)
+AUDIO_PLAYER = next((p for p in ('mpg321', 'mpg123', 'omxplayer') if shutil.which(p)), None)
+WAV_FALLBACK = AUDIO_PLAYER is None and bool(shutil.which('aplay')) and bool(shutil.which('ffmpeg'))
+
+# 재생 중인 음성 (프로세스, 재생 후 삭제할 파일들)
+PLAYBACK = None
+
+# 이 길이보다 짧은 문구는 오프라인 TTS로 바로 읽음 (긴 분석 결과만 gTTS 사용)
+SHORT_TEXT_LENGTH = 40
+
+# 고정 안내 문구는 미리 만들어 둔 음성 파일을 재사용
+TTS_CACHE_DIR = "/home/pi/label_tts_cache"
+os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+
+FIXED_PROMPTS = (
+    "라벨 분석 시스템이 시작되었습니다. 촬영하려면 엔터를 누르세요.",
+    "1초 후 촬영합니다.",
+    "2초 후 촬영합니다.",
+    "3초 후 촬영합니다.",
+    "촬영 완료. 분석 중입니다.",
+    "분석이 완료되었습니다.",
+    "업로드에 실패했습니다.",
+    "오류가 발생했습니다.",
+    "시스템을 종료합니다.",
+)
+
+# 촬영 해상도 / JPEG 품질 (업로드 용량을 줄이기 위해 서버 OCR에 충분한 정도로 설정)
+CAPTURE_SIZE = (1920, 1080)
+JPEG_QUALITY = 85
+
+# 촬영 확대 비율 (1.0 = 전체 화각, 0.5 = 중앙 절반 영역)
+# 1.0 미만이면 ISP의 ScalerCrop으로 잘라서 촬영하므로 후처리가 필요 없음
+ZOOM_FACTOR = 1.0
+
+# 카메라는 한 번만 초기화해서 재사용
+PICAM = None
 
 # ===================== OLED 디스플레이 설정 =====================
 OLED_DEVICE = None
 
+# 폰트와 흰 배경은 초기화 때 한 번만 만들어서 재사용
+OLED_FONT = None        # 여러 줄 표시용 (14px)
+OLED_FONT_LARGE = None  # 단일 메시지용 (16px)
+OLED_BACKGROUND = None
+OLED_BLANK = None
+
+# 마지막으로 보낸 화면 (같은 화면이면 I2C 전송 생략)
+OLED_LAST_FRAME = None
+
+# 업로드 스레드와 메인 스레드가 동시에 화면/스피커를 쓰지 않도록 잠금
+OLED_LOCK = threading.Lock()
+TTS_LOCK = threading.Lock()
+
+def load_oled_libs():
+    """luma.oled 불러오기 (OLED 사용 시에만)"""
+    global OLED_AVAILABLE, i2c, ssd1306, sh1106, Image, ImageDraw, ImageFont
+
+    try:
+        from luma.core.interface.serial import i2c
+        from luma.oled.device import ssd1306, sh1106
+        from PIL import Image, ImageDraw, ImageFont
+        OLED_AVAILABLE = True
+    except ImportError:
+        print("[경고] luma.oled가 설치되지 않았습니다. pip install luma.oled 로 설치하세요.")
+        OLED_AVAILABLE = False
+
+    return OLED_AVAILABLE
+
+
+def load_oled_font(paths, size):
+    """한글 폰트 로드 (없으면 기본 폰트)"""
+    for path in paths:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
 def init_oled():
     """OLED 디스플레이 초기화"""
-    global OLED_DEVICE
+    global OLED_DEVICE, OLED_FONT, OLED_FONT_LARGE, OLED_BACKGROUND, OLED_BLANK
     
-    if not OLED_AVAILABLE:
+    if not load_oled_libs():
         return None
+
+    # 큰 한글 폰트 로드
+    OLED_FONT = load_oled_font(["/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+                                "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"], 14)
+    OLED_FONT_LARGE = load_oled_font(["/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf"], 16)
+
+    # 흰 배경 (반전 모드) / 검은 배경
+    OLED_BACKGROUND = Image.new("1", (128, 64), 1)
+    OLED_BLANK = Image.new("1", (128, 64), 0)
     
     try:
         # I2C 연결 (기본 주소: 0x3C)
@@ -63,36 +162,40 @@ def init_oled():
         return None
 
 
+def oled_render(image):
+    """완성된 화면을 OLED로 한 번에 전송 (이전 화면과 같으면 생략)"""
+    global OLED_LAST_FRAME
+
+    frame = image.tobytes()
+    with OLED_LOCK:
+        if frame == OLED_LAST_FRAME:
+            return
+        OLED_DEVICE.display(image)
+        OLED_LAST_FRAME = frame
+
+
 def oled_display(lines, invert=True):
     """OLED에 여러 줄 텍스트 표시 (흰 배경, 큰 글씨)"""
     if not OLED_DEVICE:
         return
     
     try:
-        with canvas(OLED_DEVICE) as draw:
-            # 흰 배경 (반전 모드)
-            if invert:
-                draw.rectangle((0, 0, 128, 64), fill="white")
-                text_color = "black"
-            else:
-                text_color = "white"
-            
-            # 큰 한글 폰트 로드
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf", 14)
-            except:
-                try:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/nanum/NanumGothic.ttf", 14)
-                except:
-                    font = ImageFont.load_default()
-            
-            y = 2
-            line_height = 16
-            for line in lines:
-                if y + line_height > 62:
-                    break
-                draw.text((3, y), line, font=font, fill=text_color)
-                y += line_height
+        # 흰 배경 (반전 모드)
+        image = (OLED_BACKGROUND if invert else OLED_BLANK).copy()
+        text_color = "black" if invert else "white"
+
+        draw = ImageDraw.Draw(image)
+        font = OLED_FONT
+        
+        y = 2
+        line_height = 16
+        for line in lines:
+            if y + line_height > 62:
+                break
+            draw.text((3, y), line, font=font, fill=text_color)
+            y += line_height
+
+        oled_render(image)
                 
     except Exception as e:
         print(f"[OLED 오류] 표시 실패: {e}")
@@ -103,35 +206,7 @@ def oled_show_result(analysis):
     if not OLED_DEVICE:
         return
     
-    lines = []
-    
-    # 당류 (소수점 포함)
-    sugar = analysis.get("sugar_value")
-    if sugar:
-        sugar_unit = analysis.get("sugar_unit", "g")
-        lines.append(f"당류: {sugar}{sugar_unit}")
-    else:
-        lines.append("당류: -")
-    
-    # 나트륨 (소수점 포함)
-    sodium = analysis.get("sodium_value")
-    if sodium:
-        sodium_unit = analysis.get("sodium_unit", "mg")
-        lines.append(f"나트륨: {sodium}{sodium_unit}")
-    else:
-        lines.append("나트륨: -")
-    
-    # 알레르기 (짧게 표시)
-    allergens = analysis.get("allergens")
-    if allergens:
-        allergen_text = ",".join(allergens[:2])  # 최대 2개
-        if len(allergens) > 2:
-            allergen_text += "..."
-        lines.append(f"알러지:{allergen_text}")
-    else:
-        lines.append("알러지: 없음")
-    
-    oled_display(lines)
+    oled_display(build_oled_result_lines(analysis))
 
 
 def oled_show_message(message):
@@ -140,119 +215,177 @@ def oled_show_message(message):
         return
     
     try:
-        with canvas(OLED_DEVICE) as draw:
-            # 흰 배경
-            draw.rectangle((0, 0, 128, 64), fill="white")
-            
-            # 큰 폰트
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf", 16)
-            except:
-                font = ImageFont.load_default()
-            
-            # 중앙 정렬
-            bbox = draw.textbbox((0, 0), message, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            x = (128 - text_width) // 2
-            y = (64 - text_height) // 2
-            
-            draw.text((x, y), message, font=font, fill="black")
+        # 흰 배경
+        image = OLED_BACKGROUND.copy()
+        draw = ImageDraw.Draw(image)
+        font = OLED_FONT_LARGE
+        
+        # 중앙 정렬
+        bbox = draw.textbbox((0, 0), message, font=font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+        x = (128 - text_width) // 2
+        y = (64 - text_height) // 2
+        
+        draw.text((x, y), message, font=font, fill="black")
+        oled_render(image)
     except Exception as e:
         print(f"[OLED 오류] {e}")
 
 
+def init_tts():
+    """TTS 라이브러리 불러오기 (gTTS, 오프라인 TTS)"""
+    global gTTS, TTS_AVAILABLE, OFFLINE_TTS_ENGINE
+
+    # TTS 라이브러리 (gTTS 사용)
+    try:
+        from gtts import gTTS
+        TTS_AVAILABLE = True
+    except ImportError:
+        print("[경고] gTTS가 설치되지 않았습니다. pip install gtts 로 설치하세요.")
+        TTS_AVAILABLE = False
+
+    # 오프라인 TTS (pyttsx3 + espeak-ng, 짧은 안내 문구용)
+    try:
+        import pyttsx3
+        OFFLINE_TTS_ENGINE = pyttsx3.init()
+        OFFLINE_TTS_ENGINE.setProperty('voice', 'korean')
+        OFFLINE_TTS_ENGINE.setProperty('rate', 180)
+    except Exception as e:
+        print(f"[경고] 오프라인 TTS(pyttsx3/espeak-ng)를 사용할 수 없습니다: {e}")
+        OFFLINE_TTS_ENGINE = None
+
+
 def speak(text):
     """텍스트를 음성으로 읽어주기 (한국어)"""
-    if not TTS_AVAILABLE:
+    if not TTS_AVAILABLE and OFFLINE_TTS_ENGINE is None:
         print(f"[TTS 미설치] {text}")
         return
     
     if not text or not text.strip():
         return
     
+    with TTS_LOCK:
+        _speak(text)
+
+
+def tts_cache_path(text):
+    """고정 문구의 캐시 파일 경로"""
+    key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    return os.path.join(TTS_CACHE_DIR, f"{key}.mp3")
+
+
+def ensure_tts_cache(text):
+    """고정 문구 음성 파일이 없으면 생성 후 재생할 파일 경로 반환"""
+    path = tts_cache_path(text)
+    if not os.path.exists(path):
+        # 재생 중인 파일이 덮어써지지 않도록 임시 파일에 저장 후 교체
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        gTTS(text=text, lang='ko').save(tmp_path)
+        os.replace(tmp_path, path)
+
+    if not WAV_FALLBACK:
+        return path
+
+    # aplay는 wav만 지원하므로 캐시 생성 시점에 미리 변환
+    wav_path = path[:-len(".mp3")] + ".wav"
+    if not os.path.exists(wav_path):
+        tmp_path = f"{wav_path}.{threading.get_ident()}.tmp.wav"
+        convert_to_wav(path, tmp_path)
+        os.replace(tmp_path, wav_path)
+    return wav_path
+
+
+def prewarm_tts_cache():
+    """고정 안내 문구 음성 파일 미리 생성"""
+    if not TTS_AVAILABLE:
+        return
+
+    for text in FIXED_PROMPTS:
+        # 오프라인 TTS 가 있으면 짧은 문구는 _speak 가 로컬에서 합성하므로 캐시를 만들지 않음
+        if OFFLINE_TTS_ENGINE is not None and len(text) < SHORT_TEXT_LENGTH:
+            continue
+        try:
+            ensure_tts_cache(text)
+        except Exception as e:
+            print(f"[TTS 캐시 오류] {e}")
+            return
+
+
+def _speak(text):
+    """음성 생성 및 재생 (TTS_LOCK 안에서 호출)"""
     try:
         print(f"[🔊 음성 출력] {text}")
+
+        # 이전 음성이 끝난 뒤에 다음 음성 재생
+        wait_playback()
+
+        # 짧은 안내 문구는 네트워크 없이 로컬에서 합성
+        if OFFLINE_TTS_ENGINE is not None and (len(text) < SHORT_TEXT_LENGTH or not TTS_AVAILABLE):
+            OFFLINE_TTS_ENGINE.say(text)
+            OFFLINE_TTS_ENGINE.runAndWait()
+            return
+
+        if text in FIXED_PROMPTS:
+            play_audio(ensure_tts_cache(text))
+            return
         
         # gTTS로 음성 생성
         tts = gTTS(text=text, lang='ko')
         tts.save(TTS_FILE)
-        
-        # mpg321 또는 mpg123으로 재생 (라즈베리파이에서 사용 가능)
-        # mpg321이 없으면 aplay나 다른 플레이어 사용
-        players = ['mpg321', 'mpg123', 'omxplayer', 'aplay']
-        
-        for player in players:
-            try:
-                if player == 'aplay':
-                    # aplay는 wav만 지원하므로 변환 필요
-                    subprocess.run(['ffmpeg', '-y', '-i', TTS_FILE, '/tmp/tts_output.wav'], 
-                                   capture_output=True, timeout=10)
-                    subprocess.run([player, '/tmp/tts_output.wav'], 
-                                   capture_output=True, timeout=30)
-                else:
-                    subprocess.run([player, TTS_FILE], capture_output=True, timeout=30)
-                break
-            except FileNotFoundError:
-                continue
-            except subprocess.TimeoutExpired:
-                print("[경고] 음성 재생 시간 초과")
-                break
-        
-        # 임시 파일 삭제
-        if os.path.exists(TTS_FILE):
-            os.remove(TTS_FILE)
+
+        if WAV_FALLBACK:
+            play_audio(convert_to_wav(TTS_FILE, TTS_WAV_FILE), cleanup=(TTS_FILE, TTS_WAV_FILE))
+        else:
+            play_audio(TTS_FILE, cleanup=(TTS_FILE,))
             
     except Exception as e:
         print(f"[TTS 오류] {e}")
 
 
-def build_speech_text(result):
-    """서버 응답에서 읽을 텍스트 생성"""
-    lines = []
-    analysis = result.get("analysis", {})
-    
-    # 제품명
-    label = result.get("label")
-    if label:
-        lines.append(f"{label} 분석 결과입니다.")
-    else:
-        lines.append("식품 라벨 분석 결과입니다.")
-    
-    # 영양 정보
-    nutrition_parts = []
-    
-    if analysis.get("calories_value"):
-        nutrition_parts.append(f"열량 {analysis['calories_value']} {analysis.get('calories_unit', 'kcal')}")
-    
-    if analysis.get("carbs_value"):
-        nutrition_parts.append(f"탄수화물 {analysis['carbs_value']} {analysis.get('carbs_unit', 'g')}")
-    
-    if analysis.get("sugar_value"):
-        nutrition_parts.append(f"당류 {analysis['sugar_value']} {analysis.get('sugar_unit', 'g')}")
-    
-    if analysis.get("protein_value"):
-        nutrition_parts.append(f"단백질 {analysis['protein_value']} {analysis.get('protein_unit', 'g')}")
-    
-    if analysis.get("fat_value"):
-        nutrition_parts.append(f"지방 {analysis['fat_value']} {analysis.get('fat_unit', 'g')}")
-    
-    if analysis.get("sodium_value"):
-        nutrition_parts.append(f"나트륨 {analysis['sodium_value']} {analysis.get('sodium_unit', 'mg')}")
-    
-    if nutrition_parts:
-        lines.append("영양 정보: " + ", ".join(nutrition_parts) + ".")
-    else:
-        lines.append("영양 정보를 찾을 수 없습니다.")
-    
-    # 알레르기 정보 (중요!)
-    allergens = analysis.get("allergens")
-    if allergens:
-        lines.append(f"주의! 알레르기 유발 성분: {', '.join(allergens)}.")
+def convert_to_wav(mp3_path, wav_path):
+    """mp3를 aplay용 wav로 변환"""
+    subprocess.run(['ffmpeg', '-y', '-i', mp3_path, wav_path],
+                   capture_output=True, timeout=10)
+    return wav_path
+
+
+def play_audio(path, cleanup=()):
+    """음성 파일 재생 시작 (끝날 때까지 기다리지 않음)"""
+    global PLAYBACK
+
+    if WAV_FALLBACK:
+        cmd = ['aplay', path]
+    elif AUDIO_PLAYER:
+        cmd = [AUDIO_PLAYER, path]
     else:
-        lines.append("알레르기 유발 성분이 감지되지 않았습니다.")
-    
-    return " ".join(lines)
+        print("[경고] 사용할 수 있는 음성 플레이어가 없습니다. (mpg321/mpg123/omxplayer/aplay)")
+        return
+
+    process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    PLAYBACK = (process, cleanup)
+
+
+def wait_playback():
+    """재생 중인 음성이 끝날 때까지 대기 후 임시 파일 삭제"""
+    global PLAYBACK
+
+    if PLAYBACK is None:
+        return
+
+    process, cleanup = PLAYBACK
+    PLAYBACK = None
+
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        print("[경고] 음성 재생 시간 초과")
+        process.kill()
+
+    # 임시 파일 삭제
+    for path in cleanup:
+        if os.path.exists(path):
+            os.remove(path)
 
 
 def countdown(seconds=3):
@@ -269,41 +402,85 @@ def countdown(seconds=3):
     oled_show_message("촬영 중...")
 
 
+def create_still_config(picam):
+    """촬영 설정 생성 (줌은 ISP ScalerCrop으로 처리)"""
+    if ZOOM_FACTOR >= 1.0:
+        return picam.create_still_configuration(main={"size": CAPTURE_SIZE})
+
+    # ScalerCrop 은 ScalerCropMaximum(센서 유효 영역) 좌표 기준
+    max_x, max_y, max_w, max_h = picam.camera_properties.get(
+        "ScalerCropMaximum", (0, 0, *picam.sensor_resolution)
+    )
+    # 출력(CAPTURE_SIZE)과 같은 비율로 잘라야 이미지가 늘어나지 않음 (센서는 보통 4:3, 출력은 16:9)
+    out_w, out_h = CAPTURE_SIZE
+    crop_w = int(max_w * ZOOM_FACTOR)
+    crop_h = int(crop_w * out_h / out_w)
+    if crop_h > max_h:
+        crop_h = max_h
+        crop_w = int(crop_h * out_w / out_h)
+    scaler_crop = (max_x + (max_w - crop_w) // 2, max_y + (max_h - crop_h) // 2, crop_w, crop_h)
+
+    return picam.create_still_configuration(
+        main={"size": CAPTURE_SIZE},
+        controls={"ScalerCrop": scaler_crop},
+    )
+
+
+def get_camera():
+    """카메라 초기화 (최초 1회만 설정/워밍업)"""
+    global PICAM
+
+    if PICAM is None:
+        from picamera2 import Picamera2
+
+        picam = Picamera2()
+        picam.configure(create_still_config(picam))
+        picam.options["quality"] = JPEG_QUALITY
+        picam.start()
+        time.sleep(1)  # 카메라 워밍업
+        atexit.register(picam.stop)
+        PICAM = picam
+
+    return PICAM
+
+
 def capture_image():
     """라즈베리파이 카메라로 이미지 촬영"""
     # 3초 카운트다운
     countdown(3)
-    
-    picam = Picamera2()
-    picam.configure(picam.create_still_configuration())
-    picam.start()
-    time.sleep(1)  # 카메라 워밍업
 
     filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-    filepath = os.path.join(TEMP_DIR, filename)
 
-    picam.capture_file(filepath)
-    picam.stop()
+    # 파일로 저장하지 않고 메모리에서 바로 JPEG 인코딩
+    buffer = io.BytesIO()
+    get_camera().capture_file(buffer, format="jpeg")
+    image_data = buffer.getvalue()
 
-    print(f"[✓] 촬영 완료 → {filepath}")
+    print(f"[✓] 촬영 완료 → {filename} ({len(image_data) // 1024}KB)")
     speak("촬영 완료. 분석 중입니다.")
-    return filepath
+    return filename, image_data
 
 
-def upload_image(filepath):
+def upload_image(filename, image_data):
     """서버로 이미지 업로드 및 TTS 출력"""
     file_id = str(uuid.uuid4())
+    file_field = (filename, image_data, "image/jpeg")
+    
+    # JSON 응답을 받기 위한 헤더
+    headers = {"Accept": "application/json"}
 
-    with open(filepath, "rb") as f:
-        files = {"file": (os.path.basename(filepath), f, "image/jpeg")}
-        data = {"id": file_id}
-        
-        # JSON 응답을 받기 위한 헤더
-        headers = {"Accept": "application/json"}
+    print("[…] 서버로 업로드 중…")
+    UI_QUEUE.put((oled_show_message, "분석 중..."))
 
-        print("[…] 서버로 업로드 중…")
-        oled_show_message("분석 중...")
-        response = requests.post(SERVER_URL, files=files, data=data, headers=headers)
+    if STREAM_UPLOAD_AVAILABLE:
+        # multipart 본문 전체를 다시 복사해 만들지 않고 나눠서 전송
+        encoder = MultipartEncoder(fields={"id": file_id, "file": file_field})
+        headers["Content-Type"] = encoder.content_type
+        response = SESSION.post(SERVER_URL, data=encoder, headers=headers)
+    else:
+        files = {"file": file_field}
+        data = {"id": file_id}
+        response = SESSION.post(SERVER_URL, files=files, data=data, headers=headers)
 
     if response.status_code == 200:
         print("[✓] 업로드 성공!")
@@ -314,7 +491,7 @@ def upload_image(filepath):
             
             # OLED에 결과 표시 (당류, 나트륨, 알레르기)
             analysis = result.get("analysis", {})
-            oled_show_result(analysis)
+            UI_QUEUE.put((oled_show_result, analysis))
             
             # TTS로 결과 읽어주기
             speech_text = build_speech_text(result)
@@ -322,44 +499,150 @@ def upload_image(filepath):
             
         except Exception as e:
             print(f"[경고] JSON 파싱 오류: {e}")
-            oled_show_message("분석 오류")
+            UI_QUEUE.put((oled_show_message, "분석 오류"))
             speak("분석이 완료되었습니다.")
 
-        # 임시 파일 삭제
-        os.remove(filepath)
-        print("[✓] 로컬 파일 삭제 완료")
-
     else:
         print("[X] 업로드 실패! 상태코드:", response.status_code)
         print(response.text)
         speak("업로드에 실패했습니다.")
 
 
+def warm_up_connection():
+    """서버에 가벼운 요청을 보내 keep-alive 연결 준비"""
+    try:
+        SESSION.get(HEALTH_URL, timeout=2)
+    except requests.RequestException as e:
+        print(f"[경고] 서버 연결 확인 실패: {e}")
+
+
+def upload_in_background(filename, image_data):
+    """업로드 스레드에서 실행 (예외는 여기서 처리)"""
+    try:
+        upload_image(filename, image_data)
+    except Exception as e:
+        print("[ERROR] 업로드 중 문제가 발생했습니다:", e)
+        speak("오류가 발생했습니다.")
+
+
+def pump_pending():
+    """업로드 스레드가 보낸 화면 갱신 요청 처리"""
+    while True:
+        try:
+            func, arg = UI_QUEUE.get_nowait()
+        except queue.Empty:
+            return
+        func(arg)
+
+
+# 표준 입력에서 읽었지만 아직 돌려주지 않은 줄들 (한 번에 여러 줄이 들어와도 다음 호출에서 차례로 처리)
+_STDIN_BUFFER = b""
+
+
+def _pop_stdin_line():
+    """버퍼에 완성된 줄이 있으면 꺼내서 반환 (없으면 None)"""
+    global _STDIN_BUFFER
+    line, sep, rest = _STDIN_BUFFER.partition(b"\n")
+    if not sep:
+        return None
+    _STDIN_BUFFER = rest
+    return line.decode("utf-8", errors="replace").strip()
+
+
+def wait_for_enter_or_q(prompt):
+    """입력을 기다리는 동안에도 화면 갱신 요청을 처리"""
+    global _STDIN_BUFFER
+    print(prompt, end="", flush=True)
+
+    line = _pop_stdin_line()
+    if line is not None:
+        return line
+
+    selector = selectors.DefaultSelector()
+    try:
+        selector.register(sys.stdin, selectors.EVENT_READ)
+    except (PermissionError, ValueError):
+        # 일반 파일(< script.txt) 등 select 할 수 없는 입력은 그냥 한 줄씩 읽음
+        selector.close()
+        try:
+            return input().strip()
+        except EOFError:
+            return "q"
+
+    # select 는 fd 만 보므로 sys.stdin 의 텍스트 버퍼를 거치지 않고 fd 에서 직접 읽음
+    fd = sys.stdin.fileno()
+    try:
+        while True:
+            if selector.select(timeout=0.1):
+                data = os.read(fd, 4096)
+                if not data:
+                    # 입력이 닫히면(EOF) 남은 입력을 처리한 뒤 종료로 처리
+                    rest, _STDIN_BUFFER = _STDIN_BUFFER, b""
+                    return rest.decode("utf-8", errors="replace").strip() if rest else "q"
+                _STDIN_BUFFER += data
+                line = _pop_stdin_line()
+                if line is not None:
+                    return line
+            pump_pending()
+    finally:
+        selector.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="라벨 촬영 & OCR 업로드 클라이언트")
+    parser.add_argument("--oled", action=argparse.BooleanOptionalAction, default=True,
+                        help="OLED 디스플레이 사용 여부 (기본: 사용)")
+    parser.add_argument("--tts", action=argparse.BooleanOptionalAction, default=True,
+                        help="음성 안내 사용 여부 (기본: 사용)")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+
     print("\n" + "="*50)
     print("  🏷️  라벨 OCR & 음성 안내 시스템")
     print("="*50)
     
-    # OLED 초기화
-    init_oled()
+    # OLED / TTS 초기화 (사용할 때만 라이브러리 불러옴)
+    if args.oled:
+        init_oled()
+    if args.tts:
+        init_tts()
+
+    # 카메라 초기화 (촬영할 때마다 다시 켜지 않도록 미리 준비)
+    get_camera()
+
+    # 고정 안내 음성 미리 생성 (네트워크 대기 없이 바로 재생하기 위함)
+    threading.Thread(target=prewarm_tts_cache, daemon=True).start()
+
     if OLED_DEVICE:
         oled_show_message("시스템 준비 완료")
     
     # 시작 안내
     speak("라벨 분석 시스템이 시작되었습니다. 촬영하려면 엔터를 누르세요.")
+
+    # 안내 음성이 나오는 동안 서버 연결을 미리 열어 둠 (첫 업로드의 DNS/TCP 연결 지연 제거)
+    threading.Thread(target=warm_up_connection, daemon=True).start()
     
     while True:
         print("\n=== 📸 라벨 촬영 & OCR 업로드 ===")
-        cmd = input("촬영하려면 Enter, 종료하려면 q: ")
+        cmd = wait_for_enter_or_q("촬영하려면 Enter, 종료하려면 q: ")
 
         if cmd.lower() == "q":
+            # 진행 중인 업로드가 끝날 때까지 대기
+            EXECUTOR.shutdown(wait=True)
+            pump_pending()
             speak("시스템을 종료합니다.")
+            with TTS_LOCK:
+                wait_playback()
             print("종료합니다.")
             break
 
         try:
-            path = capture_image()
-            upload_image(path)
+            filename, image_data = capture_image()
+            # 업로드/분석은 백그라운드에서 진행하고 바로 다음 촬영 대기
+            EXECUTOR.submit(upload_in_background, filename, image_data)
         except Exception as e:
             print("[ERROR] 문제가 발생했습니다:", e)
             speak("오류가 발생했습니다.")
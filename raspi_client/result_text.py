@@ -0,0 +1,84 @@
+"""서버 분석 결과 → OLED/음성 문구 변환
+
+촬영할 때마다 실행되는 순수 문자열 처리만 모아 둔 모듈.
+타입 힌트가 있으므로 mypyc로 컴파일해서 사용할 수 있음 (README 참고).
+"""
+from typing import Any, Dict, List, Tuple
+
+
+def build_oled_result_lines(analysis: Dict[str, Any]) -> List[str]:
+    """OLED에 표시할 결과 줄 생성 (당류, 나트륨, 알레르기)"""
+    lines: List[str] = []
+    
+    # 당류 (소수점 포함)
+    sugar = analysis.get("sugar_value")
+    if sugar:
+        sugar_unit = analysis.get("sugar_unit", "g")
+        lines.append(f"당류: {sugar}{sugar_unit}")
+    else:
+        lines.append("당류: -")
+    
+    # 나트륨 (소수점 포함)
+    sodium = analysis.get("sodium_value")
+    if sodium:
+        sodium_unit = analysis.get("sodium_unit", "mg")
+        lines.append(f"나트륨: {sodium}{sodium_unit}")
+    else:
+        lines.append("나트륨: -")
+    
+    # 알레르기 (짧게 표시)
+    allergens = analysis.get("allergens")
+    if allergens:
+        allergen_text = ",".join(allergens[:2])  # 최대 2개
+        if len(allergens) > 2:
+            allergen_text += "..."
+        lines.append(f"알러지:{allergen_text}")
+    else:
+        lines.append("알러지: 없음")
+    
+    return lines
+
+
+# 음성으로 읽을 영양 성분 (키, 이름, 기본 단위)
+SPEECH_NUTRIENTS: Tuple[Tuple[str, str, str], ...] = (
+    ("calories", "열량", "kcal"),
+    ("carbs", "탄수화물", "g"),
+    ("sugar", "당류", "g"),
+    ("protein", "단백질", "g"),
+    ("fat", "지방", "g"),
+    ("sodium", "나트륨", "mg"),
+)
+
+
+def build_speech_text(result: Dict[str, Any]) -> str:
+    """서버 응답에서 읽을 텍스트 생성"""
+    lines: List[str] = []
+    analysis: Dict[str, Any] = result.get("analysis", {})
+    
+    # 제품명
+    label = result.get("label")
+    if label:
+        lines.append(f"{label} 분석 결과입니다.")
+    else:
+        lines.append("식품 라벨 분석 결과입니다.")
+    
+    # 영양 정보
+    nutrition_parts = [
+        f"{name} {value} {analysis.get(key + '_unit', unit)}"
+        for key, name, unit in SPEECH_NUTRIENTS
+        if (value := analysis.get(key + "_value"))
+    ]
+    
+    if nutrition_parts:
+        lines.append("영양 정보: " + ", ".join(nutrition_parts) + ".")
+    else:
+        lines.append("영양 정보를 찾을 수 없습니다.")
+    
+    # 알레르기 정보 (중요!)
+    allergens = analysis.get("allergens")
+    if allergens:
+        lines.append(f"주의! 알레르기 유발 성분: {', '.join(allergens)}.")
+    else:
+        lines.append("알레르기 유발 성분이 감지되지 않았습니다.")
+    
+    return " ".join(lines)
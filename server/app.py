@@ -1,16 +1,37 @@
-from flask import Flask, request, render_template, url_for, Response, redirect
+from flask import Flask, request, render_template, stream_template, url_for, Response, redirect
+from flask.json.provider import JSONProvider
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
+import hashlib
+import time
 import os
 import re
-import json
+import orjson
+import threading
+import shutil
+import tempfile
+import logging
+import sqlite3
 import requests
-import pytesseract
-from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict, Any, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import ahocorasick
+from PIL import Image, ImageOps, UnidentifiedImageError
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 
-from ocr_utils import run_ocr  # Tesseract 기반 OCR 함수
+from ocr_utils import run_ocr, warm_up  # Tesseract 기반 OCR 함수 (실행 경로 설정 포함)
+
+
+# 분석 과정 디버그 로그 (LOG_LEVEL=DEBUG 일 때만 출력)
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+logging.basicConfig(level=LOG_LEVEL, format="%(message)s")
+logger = logging.getLogger(__name__)
 
 
 # ===================== Flask / 경로 설정 =====================
@@ -25,21 +46,37 @@ app = Flask(
     static_folder=str(BASE_DIR / "static"),
 )
 
-# 🔹 JSON에서 Unicode escape 없이 한글 그대로 출력
-app.config['JSON_AS_ASCII'] = False
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON 처리를 orjson 으로 (UTF-8 그대로 출력하므로 한글이 escape 되지 않음)"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
 
 
-# ===================== Tesseract 경로 설정 =====================
-# Windows: C:\Program Files\Tesseract-OCR\tesseract.exe
-# Linux: /usr/bin/tesseract (기본 PATH에 있음)
-import platform
+# 🔹 JSON에서 Unicode escape 없이 한글 그대로 출력
+app.json = ORJSONProvider(app)
+
+# 정적 파일(업로드 이미지) 전송을 앞단 웹 서버에 맡김 (파이썬 워커가 파일 바이트를 흘려보내지 않음)
+# - Apache/lighttpd: USE_X_SENDFILE=true → X-Sendfile 헤더
+# - nginx: X_ACCEL_PREFIX 지정 (예: /_static) → X-Accel-Redirect 헤더 (internal location 으로 연결)
+USE_X_SENDFILE = os.environ.get("USE_X_SENDFILE", "false").lower() == "true"
+X_ACCEL_PREFIX = os.environ.get("X_ACCEL_PREFIX")
+app.config["USE_X_SENDFILE"] = USE_X_SENDFILE or bool(X_ACCEL_PREFIX)
 
-if platform.system() == "Windows":
-    TESSERACT_CMD = os.environ.get("TESSERACT_CMD", r"C:\Program Files\Tesseract-OCR\tesseract.exe")
-else:
-    TESSERACT_CMD = os.environ.get("TESSERACT_CMD", "tesseract")
 
-pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+@app.after_request
+def to_x_accel_redirect(response):
+    """nginx 용: Flask 의 X-Sendfile(절대 경로)을 X-Accel-Redirect(내부 URI)로 변환"""
+    path = response.headers.get("X-Sendfile")
+    if X_ACCEL_PREFIX and path:
+        rel = Path(path).relative_to(app.static_folder).as_posix()
+        del response.headers["X-Sendfile"]
+        response.headers["X-Accel-Redirect"] = f"{X_ACCEL_PREFIX.rstrip('/')}/{rel}"
+    return response
 
 
 # ===================== 파파고 번역 설정 =====================
@@ -52,12 +89,40 @@ PAPAGO_CLIENT_SECRET = os.environ.get("PAPAGO_CLIENT_SECRET", "c5tsieOQ3vF8rfHt9
 # 네이버 클라우드 플랫폼 API (ncloud.com)
 PAPAGO_URL = "https://naveropenapi.apigw.ntruss.com/nmt/v1/translation"
 
+# 파파고 요청용 세션 - TCP/TLS 연결을 재사용해 매 번역마다 핸드셰이크하지 않음
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32,
+                                      max_retries=Retry(total=2, backoff_factor=0.1)))
+# 인증 헤더는 고정값이므로 세션에 한 번만 설정
+SESSION.headers.update({
+    "X-NCP-APIGW-API-KEY-ID": PAPAGO_CLIENT_ID,
+    "X-NCP-APIGW-API-KEY": PAPAGO_CLIENT_SECRET,
+})
+
+# 번역 요청(네트워크 대기)을 분석과 겹쳐 실행하기 위한 스레드 풀
+TRANSLATE_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# 파파고 1회 요청 최대 글자 수 (넘으면 줄 단위로 나눠 병렬 번역)
+PAPAGO_MAX_CHARS = 5000
+
 # 번역 활성화 여부 (True로 설정하면 영어 텍스트를 한국어로 번역)
 ENABLE_TRANSLATION = os.environ.get("ENABLE_TRANSLATION", "true").lower() == "true"
 
+# 영문자가 이보다 적으면 번역할 라벨이 아니라고 보고 API 호출 생략 (OCR 잡음 등)
+TRANSLATE_MIN_LATIN_CHARS = 10
+
+
+# 한글 음절 (언어 판별용)
+_HANGUL_RE = re.compile(r"[가-힣]")
+
+# 글자 수 세기용: 해당 문자 외를 지운 길이로 센다 (매치 리스트를 만들지 않음)
+_RE_NON_HANGUL = re.compile(r"[^가-힣]+")
+_RE_NON_LATIN = re.compile(r"[^a-zA-Z]+")
+
 
 def guess_lang_pair(text: str) -> Tuple[str, str]:
-    if re.search(r"[가-힣]", text):
+    # ASCII 로만 된 텍스트(영어 라벨)는 정규식 없이 C 수준 검사로 바로 판별
+    if not text.isascii() and _HANGUL_RE.search(text):
         return "ko", "en"
     return "en", "ko"
 
@@ -70,13 +135,53 @@ def translate_text_papago(text: str) -> str:
     if not PAPAGO_CLIENT_ID or not PAPAGO_CLIENT_SECRET:
         return ""  # 번역 OFF
 
-    source, target = guess_lang_pair(text)
+    if len(text) > PAPAGO_MAX_CHARS:
+        parts = translate_many(split_for_papago(text))
+        return "\n".join(parts) if all(parts) else ""
 
-    headers = {
-        "X-NCP-APIGW-API-KEY-ID": PAPAGO_CLIENT_ID,
-        "X-NCP-APIGW-API-KEY": PAPAGO_CLIENT_SECRET,
-        "Content-Type": "application/json",
-    }
+    try:
+        return _translate_cached(text)
+    except Exception as e:
+        logger.warning("[Papago Error] %s", e)
+        return ""
+
+
+def translate_many(texts: List[str]) -> List[str]:
+    """여러 텍스트를 동시에 번역 (세션 연결 풀 공유)
+
+    TRANSLATE_EXECUTOR 작업 안에서도 불리므로 같은 풀을 쓰지 않고 별도 풀을 만듦 (교착 방지)
+    """
+    if len(texts) <= 1:
+        return [translate_text_papago(t) for t in texts]
+    with ThreadPoolExecutor(max_workers=min(8, len(texts))) as pool:
+        return list(pool.map(translate_text_papago, texts))
+
+
+def split_for_papago(text: str) -> List[str]:
+    """긴 텍스트를 줄 경계에서 PAPAGO_MAX_CHARS 이하 조각으로 나눔"""
+    chunks: List[str] = []
+    current = ""
+    for line in text.splitlines():
+        while len(line) > PAPAGO_MAX_CHARS:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:PAPAGO_MAX_CHARS])
+            line = line[PAPAGO_MAX_CHARS:]
+        if current and len(current) + 1 + len(line) > PAPAGO_MAX_CHARS:
+            chunks.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+    return [c for c in chunks if c.strip()]
+
+
+@lru_cache(maxsize=4096)
+def _translate_cached(text: str) -> str:
+    """같은 라벨 텍스트는 메모리에서 바로 반환 (실패는 예외로 빠져나가 캐시되지 않음)"""
+    source, target = guess_lang_pair(text)
 
     payload = {
         "source": source,
@@ -84,18 +189,15 @@ def translate_text_papago(text: str) -> str:
         "text": text,
     }
 
-    try:
-        resp = requests.post(PAPAGO_URL, headers=headers, json=payload, timeout=10)
-        resp.raise_for_status()
-        return resp.json()["message"]["result"]["translatedText"]
-    except Exception as e:
-        print("[Papago Error]", e)
-        return ""
+    # json= 인자가 Content-Type: application/json 을 붙여줌
+    resp = SESSION.post(PAPAGO_URL, json=payload, timeout=10)
+    resp.raise_for_status()
+    return resp.json()["message"]["result"]["translatedText"]
 
 
 # ===================== 영양 분석 Regex =====================
 
-@dataclass
+@dataclass(slots=True)
 class NutritionInfo:
     # 칼로리
     calories_value: Optional[float] = None
@@ -175,6 +277,9 @@ ALLERGEN_KEYWORDS_SAFE = [
 # "게"는 오탐이 너무 많아 제외 (게살, 꽃게, 대게는 SAFE에 있음)
 ALLERGEN_KEYWORDS_SHORT = ["밀", "콩", "굴", "깨", "잣", "란"]
 
+# 단어 하나가 알레르기 키워드인지 확인용 (리스트 선형 탐색 대신 해시 조회)
+ALLERGEN_KEYWORD_SET = frozenset(ALLERGEN_KEYWORDS_SAFE) | frozenset(ALLERGEN_KEYWORDS_SHORT)
+
 # 짧은 키워드가 허용되는 접미사/접두사 패턴
 ALLERGEN_CONTEXT_SUFFIXES = ["함유", "포함", "사용", "첨가", "성분", "원료", "들어"]
 ALLERGEN_CONTEXT_PREFIXES = ["함", "유", "포", "알레르기", "알러지", "주의"]
@@ -234,113 +339,528 @@ ALLERGEN_TYPO_MAP = {
 }
 
 
+def build_keyword_automaton(keywords: Sequence[str]) -> "ahocorasick.Automaton":
+    """키워드 목록으로 Aho-Corasick 오토마톤 생성 (여러 키워드를 한 번의 스캔으로 검색)"""
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
+
+def find_keywords(automaton: "ahocorasick.Automaton", *texts: str) -> set:
+    """텍스트들에 포함된 키워드 집합 (kw in text 와 동일, 겹치는 키워드도 모두 찾음)"""
+    found = set()
+    for text in texts:
+        found.update(kw for _, kw in automaton.iter(text))
+    return found
+
+
+_SAFE_KEYWORD_AUTOMATON = build_keyword_automaton(ALLERGEN_KEYWORDS_SAFE)
+# 키워드 목록 순서 (로그를 목록 순서대로 출력하기 위함)
+_SAFE_KEYWORD_ORDER = {kw: i for i, kw in reversed(list(enumerate(ALLERGEN_KEYWORDS_SAFE)))}
+
+
+_SHORT_KEYWORD_AUTOMATON = build_keyword_automaton(ALLERGEN_KEYWORDS_SHORT)
+# OCR 오류 대비 마지막에 공백 제거 텍스트에서 다시 찾는 주요 알레르겐 (2글자 이상, 1글자는 오탐 발생)
+MAJOR_ALLERGENS_CHECK = ("오징어", "새우", "꽃게", "대게", "조개", "우유", "계란", "대두", "땅콩", "호두", "아몬드", "밀가루", "글루텐")
+_MAJOR_ALLERGEN_AUTOMATON = build_keyword_automaton(MAJOR_ALLERGENS_CHECK)
+# 짧은 키워드를 허용하는 명시적 알레르기 표시 (섹션 / 괄호)
+_EXPLICIT_ALLERGEN_MARKERS = ("함유", "포함", "알레르기", "알러지")
+_PAREN_ALLERGEN_MARKERS = _EXPLICIT_ALLERGEN_MARKERS + ("주의",)
+
+
+def in_keyword_order(hits: set) -> list:
+    """찾은 안전 키워드를 ALLERGEN_KEYWORDS_SAFE 순서로 정렬"""
+    return sorted(hits, key=_SAFE_KEYWORD_ORDER.__getitem__)
+
+
+def _can_overlap(a: str, b: str) -> bool:
+    """두 문자열이 텍스트에서 겹쳐 나타날 수 있는지 (포함 관계 또는 접미사=접두사)"""
+    if a in b or b in a:
+        return True
+    for i in range(1, min(len(a), len(b))):
+        if a[-i:] == b[:i] or b[-i:] == a[:i]:
+            return True
+    return False
+
+
+def build_replace_phases(replacements: Dict[str, str]) -> list:
+    """
+    순서대로 str.replace 를 반복한 것과 결과가 같은 단계별 치환 테이블 생성
+    - 서로 엮이지 않는 규칙끼리 한 단계로 묶어 정규식 한 번으로 치환
+    - 앞 규칙의 키/결과가 뒤 규칙의 키와 겹칠 수 있으면 다음 단계로 분리
+    - 키와 값이 같은 규칙은 건너뜀
+    """
+    phases = []
+    current: Dict[str, str] = {}
+    for key, value in replacements.items():
+        if key == value:
+            continue
+        if any(_can_overlap(k, key) or _can_overlap(v, key) for k, v in current.items()):
+            phases.append(current)
+            current = {}
+        current[key] = value
+    if current:
+        phases.append(current)
+    return [
+        (re.compile("|".join(map(re.escape, table))) if len(table) > 1 else None, table)
+        for table in phases
+    ]
+
+
+def apply_replace_phases(text: str, phases: list) -> str:
+    """build_replace_phases 결과로 치환 (규칙 하나짜리 단계는 str.replace)"""
+    for pattern, table in phases:
+        if pattern is None:
+            (key, value), = table.items()
+            text = text.replace(key, value)
+        else:
+            text = pattern.sub(lambda m: table[m.group(0)], text)
+    return text
+
+
+# OCR 흔한 오타 → 올바른 표기 (위에서부터 순서대로 적용)
+_NORMALIZE_MAP = {
+    # 열량 오타
+    "엷니물론": "열량",
+    "열망": "열량",
+    "열닝": "열량",
+    "엻량": "열량",
+    "열량": "열량",
+    "영량": "열량",
+    # 나트륨 오타 (나트룹, 나트름 등)
+    "나트룹": "나트륨",
+    "나트름": "나트륨",
+    "나트릅": "나트륨",
+    "나트류": "나트륨",
+    "나뜨륨": "나트륨",
+    "나트륨": "나트륨",
+    "나트룸": "나트륨",
+    "나튜륨": "나트륨",
+    # 당류 오타 (당료, 당루, 담류 등)
+    "당료": "당류",
+    "당류류": "당류",
+    "당루": "당류",
+    "당류": "당류",
+    "담류": "당류",
+    "담 류": "당류",
+    "담류류": "당류",
+    # 탄수화물 오타
+    "단수화물": "탄수화물",
+    "탄수화믈": "탄수화물",
+    "탄수화뭃": "탄수화물",
+    "@수회물": "탄수화물",
+    "@수화물": "탄수화물",
+    # 단백질 오타
+    "단백지": "단백질",
+    "단백잘": "단백질",
+    "백칠": "단백질",
+    "백질": "단백질",
+    # 지방 오타
+    "지밥": "지방",
+    "지빵": "지방",
+    "재방": "지방",
+    "재밤": "지방",
+    # 포화지방
+    "포화지밥": "포화지방",
+    "포화지빵": "포화지방",
+    "피회재방": "포화지방",
+    "피회재밤": "포화지방",
+    "프화지방": "포화지방",
+    # 트랜스지방
+    "트스지방": "트랜스지방",
+    "트렌스지방": "트랜스지방",
+    "흐재": "트랜스지방",
+    # 콜레스테롤
+    "플레스로": "콜레스테롤",
+    "콜레스로": "콜레스테롤",
+    "콜레스테릴": "콜레스테롤",
+    "콜레스테룰": "콜레스테롤",
+    "킬세물": "콜레스테롤",
+    # 알레르기 관련 오타
+    "알레르기": "알레르기",
+    "알러지": "알레르기",
+    "알러르기": "알레르기",
+    "알레지": "알레르기",
+    # 알레르기 성분 오타
+    "우유우": "우유",
+    "대두두": "대두",
+    "계란란": "계란",
+    "달걀걀": "달걀",
+    # 단백질 오타
+    "단백지": "단백질",
+    "단백잘": "단백질",
+    # 탄수화물 오타
+    "탄수화뭃": "탄수화물",
+    "탄수화믈": "탄수화물",
+    # 칼로리 오타
+    "칼로리리": "칼로리",
+    "kcaI": "kcal",
+    "KcaI": "kcal",
+    # 지방 오타
+    "지밥": "지방",
+    "지빵": "지방",
+    # 포화지방
+    "포화지빵": "포화지방",
+    # 콜레스테롤
+    "콜레스테릴": "콜레스테롤",
+    "콜레스테룰": "콜레스테롤",
+    # 단위
+    "9": "g",  # 숫자 9가 g로 오인식되는 경우는 문맥에 따라
+    "mq": "mg",
+    "M9": "mg",
+}
+
+_NORMALIZE_PHASES = build_replace_phases(_NORMALIZE_MAP)
+# 알레르기 키워드 오타 보정도 같은 방식으로 (순서대로 replace 한 것과 결과 동일)
+_ALLERGEN_TYPO_PHASES = build_replace_phases(ALLERGEN_TYPO_MAP)
+# 오타 키가 하나라도 있는지 확인용 (없으면 어느 단계도 치환하지 않으므로 전부 건너뜀)
+_NORMALIZE_ANY_RE = re.compile("|".join(
+    re.escape(key) for _, table in _NORMALIZE_PHASES for key in table
+))
+
+
 def normalize_ocr_text(text: str) -> str:
-    """OCR 텍스트 정규화 - 흔한 오타 수정"""
-    replacements = {
-        # 열량 오타
-        "엷니물론": "열량",
-        "열망": "열량",
-        "열닝": "열량",
-        "엻량": "열량",
-        "열량": "열량",
-        "영량": "열량",
-        # 나트륨 오타 (나트룹, 나트름 등)
-        "나트룹": "나트륨",
-        "나트름": "나트륨",
-        "나트릅": "나트륨",
-        "나트류": "나트륨",
-        "나뜨륨": "나트륨",
-        "나트륨": "나트륨",
-        "나트룸": "나트륨",
-        "나튜륨": "나트륨",
-        # 당류 오타 (당료, 당루, 담류 등)
-        "당료": "당류",
-        "당류류": "당류",
-        "당루": "당류",
-        "당류": "당류",
-        "담류": "당류",
-        "담 류": "당류",
-        "담류류": "당류",
-        # 탄수화물 오타
-        "단수화물": "탄수화물",
-        "탄수화믈": "탄수화물",
-        "탄수화뭃": "탄수화물",
-        "@수회물": "탄수화물",
-        "@수화물": "탄수화물",
-        # 단백질 오타
-        "단백지": "단백질",
-        "단백잘": "단백질",
-        "백칠": "단백질",
-        "백질": "단백질",
-        # 지방 오타
-        "지밥": "지방",
-        "지빵": "지방",
-        "재방": "지방",
-        "재밤": "지방",
-        # 포화지방
-        "포화지밥": "포화지방",
-        "포화지빵": "포화지방",
-        "피회재방": "포화지방",
-        "피회재밤": "포화지방",
-        "프화지방": "포화지방",
-        # 트랜스지방
-        "트스지방": "트랜스지방",
-        "트렌스지방": "트랜스지방",
-        "흐재": "트랜스지방",
-        # 콜레스테롤
-        "플레스로": "콜레스테롤",
-        "콜레스로": "콜레스테롤",
-        "콜레스테릴": "콜레스테롤",
-        "콜레스테룰": "콜레스테롤",
-        "킬세물": "콜레스테롤",
-        # 알레르기 관련 오타
-        "알레르기": "알레르기",
-        "알러지": "알레르기",
-        "알러르기": "알레르기",
-        "알레지": "알레르기",
-        # 알레르기 성분 오타
-        "우유우": "우유",
-        "대두두": "대두",
-        "계란란": "계란",
-        "달걀걀": "달걀",
-        # 단백질 오타
-        "단백지": "단백질",
-        "단백잘": "단백질",
-        # 탄수화물 오타
-        "탄수화뭃": "탄수화물",
-        "탄수화믈": "탄수화물",
-        # 칼로리 오타
-        "칼로리리": "칼로리",
-        "kcaI": "kcal",
-        "KcaI": "kcal",
-        # 지방 오타
-        "지밥": "지방",
-        "지빵": "지방",
-        # 포화지방
-        "포화지빵": "포화지방",
-        # 콜레스테롤
-        "콜레스테릴": "콜레스테롤",
-        "콜레스테룰": "콜레스테롤",
-        # 단위
-        "9": "g",  # 숫자 9가 g로 오인식되는 경우는 문맥에 따라
-        "mq": "mg",
-        "M9": "mg",
-    }
-    
+    """OCR 텍스트 정규화 - 흔한 오타 수정 (바꿀 것이 없으면 입력 문자열을 그대로 반환)"""
     result = text
-    for wrong, correct in replacements.items():
-        result = result.replace(wrong, correct)
+    if _NORMALIZE_ANY_RE.search(result):
+        result = apply_replace_phases(result, _NORMALIZE_PHASES)
+    
+    # 아래 두 치환은 모두 "9" 가 있어야 일어남
+    if "9" not in result:
+        return result
     
     # "숫자 9" 패턴을 "숫자 g"로 변환 (OCR이 g를 9로 인식하는 경우)
     # 예: "18 9" → "18 g", "2 9" → "2 g"
-    result = re.sub(r"(\d+(?:\.\d+)?)\s*9\b", r"\1 g", result)
+    result = _RE_NUM_SPACE_9.sub(r"\1 g", result)
     
     # "숫자9" 패턴도 처리 (공백 없는 경우)
-    result = re.sub(r"(\d+(?:\.\d+)?)9\b(?!\d)", r"\1g", result)
+    result = _RE_NUM_9.sub(r"\1g", result)
     
     return result
 
 
+# ===================== 정규식 (미리 컴파일) =====================
+
+# 공백 (정규화/압축 텍스트 생성용)
+_WS_RE = re.compile(r"\s+")
+
+# 숫자 패턴 (정수 또는 소수)
+_NUM = r"(?P<value>\d+(?:[.,]\d+)?)"
+
+# 당류
+_SUGAR_PATTERNS = [
+    # 기본 패턴: "당류 5g", "당료 2 g" (OCR 오타 포함)
+    re.compile(rf"(?:당류|당료|담류|당분|(?i:sugar|sugars))\s*[:\-]?\s*{_NUM}\s*(?P<unit>(?i:g|mg)|그램|%)?"),
+    # "당류 5g" 또는 "당류: 5 g" 형태
+    re.compile(rf"(?:당류|당료|담류)\s*[:\-]?\s*{_NUM}\s*(?P<unit>(?i:g|mg))?"),
+    # 공백 없는 패턴: "당류5g"
+    re.compile(rf"(?:당류|당료|담류){_NUM}(?P<unit>(?i:g|mg))?"),
+]
+
+# 나트륨
+_SODIUM_PATTERNS = [
+    # 기본 패턴: "나트륨 150mg", "나트륨: 150 mg", "나트룹 150 mg"
+    re.compile(rf"(?:나트륨|나트름|나트류|나트룹|나트룸|(?i:sodium))\s*[:\-]?\s*{_NUM}\s*(?P<unit>(?i:mg|g)|%)?"),
+    # 숫자 먼저 오는 패턴: "150mg 나트륨"
+    # (?<!\d): 숫자 중간에서 다시 시작하지 않음 (결과는 같고, 긴 숫자열에서 O(n²) 재시도 방지)
+    re.compile(rf"(?<!\d){_NUM}\s*(?P<unit>mg|g)\s*(?:나트륨|나트름|나트룹|sodium)", re.IGNORECASE),
+    # 공백 없는 패턴: "나트륨150mg"
+    re.compile(rf"(?:나트륨|나트름|나트룹){_NUM}(?P<unit>(?i:mg|g))?"),
+    # Na 패턴
+    re.compile(rf"Na\s*[:\-]?\s*{_NUM}\s*(?P<unit>mg|g)?", re.IGNORECASE),
+]
+
+# ----- normalize_ocr_text 용 -----
+# "18 9" → "18 g", "189" → "18g" (OCR이 g를 9로 인식하는 경우)
+_RE_NUM_SPACE_9 = re.compile(r"(\d+(?:\.\d+)?)\s*9\b")
+_RE_NUM_9 = re.compile(r"(\d+(?:\.\d+)?)9\b(?!\d)")
+
+# ----- 열량 -----
+_CALORIES_PATTERNS = [
+    re.compile(rf"(?:열량|에너지|칼로리|(?i:Calories?|Energy))\s*[:\-]?\s*{_NUM}\s*(?P<unit>(?i:kcal|cal|kca1)|킬로칼로리)?"),
+    re.compile(rf"(?<!\d){_NUM}\s*(?P<unit>kcal|kca1|Kcal|킬로칼로리)", re.IGNORECASE),
+    # 공백 없는 패턴
+    re.compile(rf"(?:열량|칼로리){_NUM}(?P<unit>(?i:kcal))?"),
+    # "당 192kcal" 패턴 (1봉지당, 1회 제공량당 등)
+    re.compile(rf"당\s*{_NUM}\s*(?P<unit>(?i:kcal|kca1|Kcal))"),
+    # "192 kcal" 단독 (kcal 앞 숫자)
+    re.compile(rf"(?<![0-9]){_NUM}\s*(?P<unit>kcal|kca1|Kcal|킬로칼로리)", re.IGNORECASE),
+]
+_RE_CAL_COMPACT = re.compile(r"열량(\d+(?:\.\d+)?)((?i:kcal))?")
+_RE_KCAL_DIRECT = re.compile(r"(\d{2,4})\s*(?:kcal|kca1|Kcal)", re.IGNORECASE)
+_RE_KCAL_SPACED = re.compile(r"(\d)\s*(\d)\s*(\d)\s*(?:kcal|kca1)", re.IGNORECASE)  # "1 9 2 kcal"
+_RE_KCAL_G9 = re.compile(r"(\d)[gㅇOo](\d)\s*(?:kcal|kca1|Kcal)", re.IGNORECASE)  # "1g2 kcal"
+_RE_KCAL_LINE = re.compile(r"(\d{2,3})\s*(?:kcal|kca1|Kcal|키)", re.IGNORECASE)
+_RE_KCAL_DANG = re.compile(r"[봉회]\s*지?\s*당\s*(\d{2,3})")  # "1봉지당 192"
+
+# ----- 탄수화물 -----
+_CARBS_PATTERNS = [
+    re.compile(rf"(?:탄수화물|단수화물|탄수화믈|(?i:carbohydrate|carb))\s*[:\-]?\s*{_NUM}\s*(?P<unit>(?i:g|mg)|그램|%)?"),
+]
+_RE_CARBS_COMPACT = re.compile(r"[탄단]수화물(\d+(?:\.\d+)?)((?i:g|mg))?")
+_RE_CARBS_LINE = re.compile(r"[탄단]\s*수\s*화\s*물\s*(\d{1,2})\s*(?:(?i:g)|8|9)")
+_RE_CARBS_COMPACT_G = re.compile(r"[탄단]수화물(\d{1,2})(?i:[g89])")
+_RE_CARBS_208 = re.compile(r"[탄단]\s*수\s*화\s*물\s*(\d{1,2})\s*8")  # "20 8" → 28
+
+# ----- 당류 (기본 패턴은 _SUGAR_PATTERNS) -----
+_RE_SUGAR_COMPACT = re.compile(r"[당담][류료](\d+(?:\.\d+)?)((?i:g|mg))?")
+_RE_SUGAR_PCT = re.compile(r"[당담][류료]\s*(\d+(?:\.\d+)?)\s*(?i:g)\s*\d+\s*%")
+_RE_SUGAR_SPACED = re.compile(r"[당담]\s*류\s*(\d+(?:\.\d+)?)\s*(?:(?i:g)|그램)")
+_RE_SUGAR_NUM_ONLY = re.compile(r"[당담]\s*류[^0-9]*(\d{1,2})(?:\s+|\s*[^0-9])(\d{1,3})\s*%?")
+_RE_SUGAR_G8 = re.compile(r"[당담][류료][^0-9]*(\d{1,2})8")  # "138" → 13g
+
+# ----- 단백질 -----
+_PROTEIN_PATTERNS = [
+    re.compile(rf"(?:단백질|(?i:protein))\s*[:\-]?\s*{_NUM}\s*(?P<unit>(?i:g|mg)|그램|%)?"),
+]
+_RE_PROTEIN_COMPACT = re.compile(r"단백질(\d+(?:\.\d+)?)\s*(?i:g)")
+
+# ----- 지방 -----
+_FAT_PATTERNS = [
+    re.compile(rf"(?:지방|시방|(?i:fat|total\s*fat))\s*[:\-]?\s*{_NUM}\s*(?P<unit>(?i:g|mg)|그램|%)?"),
+]
+_RE_FAT_COMPACT = re.compile(r"(?<!포화)(?<!트랜스)(?<!스)[지시]방(\d+(?:\.\d+)?)\s*(?i:g)?")
+_RE_FAT_LINE = re.compile(r"[지시]방\s*(\d+(?:\.\d+)?)\s*(?:(?i:g)|8)\s*\d*\s*%?")
+_RE_FAT_88 = re.compile(r"[지시]방\s*(\d)8\s*1[59]")  # "시방 88 15%"
+_RE_FAT_COMPACT_PCT = re.compile(r"(?<!포화)(?<!트랜스)[지시]방(\d)(?i:[g8])?1[59]")
+
+_SAT_FAT_PATTERNS = [
+    re.compile(rf"(?:포화지방|포화\s*지방|(?i:saturated\s*fat))\s*[:\-]?\s*{_NUM}\s*(?P<unit>(?i:g|mg)|그램|%)?"),
+]
+_TRANS_FAT_PATTERNS = [
+    re.compile(rf"(?:트랜스지방|트랜스\s*지방|트스지방|트렌스지방|(?i:trans\s*fat))\s*[:\-]?\s*{_NUM}\s*(?P<unit>(?i:g|mg)|그램|%)?"),
+]
+
+# ----- 콜레스테롤 -----
+_CHOLESTEROL_PATTERNS = [
+    re.compile(rf"(?:콜레스테롤|플레스로|콜레스로|(?i:cholesterol))\s*[:\-]?\s*{_NUM}\s*(?P<unit>(?i:mg|g)|%)?"),
+]
+
+# ----- 항목별 기본 패턴 -----
+# 항목 → 패턴 목록 (extract_primary_nutrients 가 항목마다 순서대로 시도)
+_PRIMARY_NUTRIENT_PATTERNS = {
+    "calories": _CALORIES_PATTERNS,
+    "carbs": _CARBS_PATTERNS,
+    "sugar": _SUGAR_PATTERNS,
+    "protein": _PROTEIN_PATTERNS,
+    "fat": _FAT_PATTERNS,
+    "saturated_fat": _SAT_FAT_PATTERNS,
+    "trans_fat": _TRANS_FAT_PATTERNS,
+    "cholesterol": _CHOLESTEROL_PATTERNS,
+    "sodium": _SODIUM_PATTERNS,
+}
+
+# ----- 나트륨 (기본 패턴은 _SODIUM_PATTERNS) -----
+_RE_SODIUM_COMPACT = re.compile(r"나트[륨름류룹룸](\d+(?:\.\d+)?)((?i:mg|g))?")
+_RE_SODIUM_PCT = re.compile(r"나트[륨름류룹룸]\s*(\d+(?:\.\d+)?)\s*(?i:mg)\s*\d+\s*%")
+_RE_SODIUM_SPACED = re.compile(r"나\s*트\s*[륨름류]\s*(\d+(?:\.\d+)?)\s*(?:(?i:mg)|밀리그램)")
+_RE_SODIUM_PARTIAL = re.compile(r"트[륨름류]\s*(\d+(?:\.\d+)?)\s*(?:(?i:mg)|밀리그램)")
+_RE_SODIUM_MG_ONLY = re.compile(r"(\d{2,3})\s*mg\s*\d*\s*%?", re.IGNORECASE)
+_RE_SODIUM_BIG = re.compile(r"[나트][트륨름류룹]?[^0-9]*(\d{3})(\d{1,2})\d*")  # "16008" → 160
+_RE_MG_LINE = re.compile(r"(\d{2,3})\s*mg", re.IGNORECASE)
+_RE_SODIUM_MG_PCT = re.compile(r"(\d{2,3})mg\d{1,2}%", re.IGNORECASE)  # "140mg7%"
+
+# ----- 1회 제공량 -----
+_RE_SERVING = re.compile(
+    r"(?:1회\s*제공량|1회\s*섭취량|(?i:serving\s*size)|총\s*내용량)[:\s]*([0-9]+(?:\.[0-9]+)?\s*(?:(?i:g|ml|mL)|그램|밀리리터)?)",
+)
+
+# ----- 알레르기 관련 섹션 -----
+_ALLERGEN_SECTION_RES = [
+    re.compile(p)
+    for p in (
+        r"(?:알[레러]르기|알[레러]지|(?i:allerg))[^:]*[:\s]*([^\n.。]{5,200})",
+        r"(?:함유|포함|(?i:contains?))[:\s]*([^\n.。]+)",
+        r"(?:이\s*제품은?|본\s*제품은?)[^\n.。]*(?:사용|제조|생산)[^\n.。]*",
+        r"(?:원재료|원료|원재료명)[:\s및]*([^\n]{10,500})",
+        r"[(\(]([^)\)]*(?:우유|대두|밀|계란|땅콩|견과|새우|게|오징어|조개)[^)\)]*)[)\)]",
+        r"(?:주의|경고|알림)[:\s]*([^\n.。]{5,200})",
+        r"(?:동일|같은)\s*(?:제조|생산|시설)[^\n.。]*",
+    )
+]
+# 짧은 키워드는 구분자로 둘러싸인 경우만 인정
+_SHORT_KEYWORD_RES = [
+    (kw, re.compile(rf"(?:^|[,，、\s(（])({kw})(?:[,，、\s)）]|$)"))
+    for kw in ALLERGEN_KEYWORDS_SHORT
+]
+_CONTEXT_SUFFIX_RES = [
+    (suffix, re.compile(rf"(\w{{1,10}})\s*{suffix}"))
+    for suffix in ALLERGEN_CONTEXT_SUFFIXES
+]
+_RE_PAREN = re.compile(r"[(\(]([^)\)]+)[)\)]")
+# 원재료 목록 (한글 전용 패턴이라 IGNORECASE 불필요)
+_INGREDIENT_LIST_RES = [
+    re.compile(r"원재료[명]?[:\s및]*(.+?)(?:영양|내용|유통|보관|주의|$)", re.DOTALL),
+    re.compile(r"재료[:\s]*(.+?)(?:영양|내용|유통|보관|$)", re.DOTALL),
+]
+_RE_SPLIT_ITEMS = re.compile(r"[,，、/·\s]+")
+
+# ----- 백업 추출 (줄 단위 / 압축 텍스트 / 전체 텍스트) -----
+_RE_NUM_UNIT = re.compile(r"(\d+(?:[.,]\d+)?)\s*(mg|g|kcal|%)?")
+_RE_COMPACT_STRIP = re.compile(r"[\s\|\[\]\{\}\(\)\-_~]")  # 공백, 특수문자
+_RE_COMPACT_SODIUM = re.compile(r"나트[륨름룹류](\d+(?:\.\d+)?)\s*(?i:mg|m[gG9])?")
+_RE_COMPACT_SUGAR = re.compile(r"당[류료](\d+(?:\.\d+)?)\s*[gG]?\s*\d*%?")
+_RE_COMPACT_CARBS = re.compile(r"탄수화물(\d+(?:\.\d+)?)\s*[gG]?\s*\d*%?")
+_RE_COMPACT_PROTEIN = re.compile(r"단백질(\d+(?:\.\d+)?)\s*[gG]?\s*\d*%?")
+_RE_COMPACT_FAT = re.compile(r"(?<!포화)(?<!트랜스)(?<!스)지방(\d+(?:\.\d+)?)\s*[gG]?")
+_RE_COMPACT_KCAL = re.compile(r"(\d+(?:\.\d+)?)\s*(?:kcal|kca1|킬로칼로리|Kcal)", re.IGNORECASE)
+# 숫자 + 단위 (kcal / mg / g) - 그룹 이름으로 단위 구분, 한 번의 스캔으로 세 백업을 처리
+_RE_FULL_UNITS = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(?:(?P<kcal>kcal|kca1|킬로칼로리)|(?P<mg>mg)|(?P<g>g)\b)", re.IGNORECASE
+)
+
+# ----- 영어 라벨 -----
+_EN_NUTRIENT_PATTERNS = {
+    kind: [re.compile(p, re.IGNORECASE) for p in patterns]
+    for kind, patterns in {
+        "calories": (
+            r"calories?\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(kcal|cal)?",
+            r"energy\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(kcal|kj)?",
+        ),
+        "carbs": (
+            r"(?:total\s+)?carbohydrate[s]?\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",
+            r"carbs?\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",
+        ),
+        "sugar": (r"(?:total\s+)?sugar[s]?\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",),
+        "protein": (r"protein[s]?\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",),
+        "fat": (r"(?:total\s+)?fat\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",),
+        "saturated_fat": (r"saturated\s*fat\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",),
+        "trans_fat": (r"trans\s*fat\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",),
+        "cholesterol": (r"cholesterol\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(mg|g)?",),
+        "sodium": (r"sodium\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(mg|g)?",),
+    }.items()
+}
+
+# 영어 알레르기 성분
+EN_ALLERGEN_KEYWORDS = [
+    "milk", "egg", "peanut", "tree nut", "soy", "wheat", "fish", "shellfish",
+    "sesame", "gluten", "lactose", "almond", "walnut", "cashew", "hazelnut",
+    "pecan", "pistachio", "macadamia", "shrimp", "crab", "lobster", "clam",
+    "oyster", "squid", "octopus", "mussel", "scallop"
+]
+_EN_ALLERGEN_RES = [(a, re.compile(rf"\b{a}\b", re.IGNORECASE)) for a in EN_ALLERGEN_KEYWORDS]
+_RE_EN_ALLERGEN_SECTION = re.compile(r"(?:contains|allergen|allergy)[:\s]+(.+?)(?:\.|$)", re.IGNORECASE)
+
+
+# OCR 이 단위 "g" 를 잘못 읽는 숫자 (13g → 138, 28g → 286 등)
+_G_MISREAD_DIGITS = frozenset({6, 8, 9})
+
+
+def strip_misread_g(value: float, lo: float, hi: float) -> Optional[float]:
+    """
+    끝자리가 g 오인식 숫자면 떼어낸 값 반환 (정수 연산, 문자열 변환 없음)
+    Returns: 보정값 (보정 대상이 아니거나 lo~hi 범위 밖이면 None)
+    """
+    number = int(value)
+    if number < 10 or number % 10 not in _G_MISREAD_DIGITS:
+        return None
+    corrected = float(number // 10)
+    return corrected if lo <= corrected <= hi else None
+
+
+# 줄 단위 검색: (항목, 정규식, 최소, 최대, 이 단어가 있는 줄은 제외)
+_LINE_EXTRACTORS = (
+    ("calories", _RE_KCAL_LINE, 50, 999, ()),
+    ("carbs", _RE_CARBS_LINE, 5, 60, ()),
+    ("fat", _RE_FAT_LINE, 3, 50, ("포화", "트랜스")),  # 포화지방/트랜스지방 제외
+    ("sodium", _RE_MG_LINE, 50, 999, ()),
+)
+
+
+def scan_lines(lines: List[str]) -> Dict[str, float]:
+    """
+    줄 목록을 한 번만 돌며 항목별로 범위 안에 드는 첫 값 찾기
+    Returns: {항목: 값} (찾은 항목만)
+    """
+    found: Dict[str, float] = {}
+    for line in lines:
+        for name, pattern, lo, hi, skip_words in _LINE_EXTRACTORS:
+            if name in found or any(word in line for word in skip_words):
+                continue
+            match = pattern.search(line)
+            if match:
+                val = float(match.group(1))
+                if lo <= val <= hi:
+                    found[name] = val
+        if len(found) == len(_LINE_EXTRACTORS):
+            break
+    return found
+
+
+# 백업 추출 대상 항목 (백업 단계마다 이 순서로 비어 있는 항목을 채움)
+_BACKUP_KINDS = ("sodium", "sugar", "carbs", "protein", "fat", "calories")
+
+# 압축 텍스트 백업: (항목, 패턴, 단위, 로그 이름)
+_COMPACT_EXTRACTORS = (
+    ("sodium", _RE_COMPACT_SODIUM, "mg", "나트륨"),
+    ("sugar", _RE_COMPACT_SUGAR, "g", "당류"),
+    ("carbs", _RE_COMPACT_CARBS, "g", "탄수화물"),
+    ("protein", _RE_COMPACT_PROTEIN, "g", "단백질"),
+    ("fat", _RE_COMPACT_FAT, "g", "지방"),  # 포화지방, 트랜스지방 제외
+    ("calories", _RE_COMPACT_KCAL, "kcal", "열량"),
+)
+
+
+def scan_compact(compact_text: str, kinds: List[str]) -> Dict[str, tuple]:
+    """
+    압축 텍스트에서 비어 있는 항목만 찾기 (예: 당류25g25% → 25)
+    Returns: {항목: (value, unit)} (찾은 항목만)
+    """
+    found: Dict[str, tuple] = {}
+    for kind, pattern, unit, label in _COMPACT_EXTRACTORS:
+        if kind not in kinds:
+            continue
+        match = pattern.search(compact_text)
+        if match:
+            found[kind] = (float(match.group(1)), unit)
+            if found[kind][0]:
+                logger.debug("[압축추출] %s: %s%s", label, found[kind][0], unit)
+    return found
+
+
+# 줄 단위 백업: 항목 → (찾는 키워드, 단위가 없을 때 기본 단위)
+_LINE_BACKUPS = {
+    "sodium": (("나트륨", "나트룹", "나트름", "sodium", "na"), "mg"),
+    "sugar": (("당류", "당료", "sugar"), "g"),
+    "carbs": (("탄수화물", "단수화물", "carb"), "g"),
+    "protein": (("단백질", "protein"), "g"),
+    "fat": (("지방", "fat"), "g"),
+    "calories": (("열량", "칼로리", "calorie", "kcal", "energy"), "kcal"),
+}
+
+
+def find_numbers_near_keywords(lines: List[str], kinds: List[str]) -> Dict[str, tuple]:
+    """
+    줄 목록을 한 번만 돌며 항목별 키워드가 있는 줄 또는 다음 줄의 첫 숫자 찾기
+    Returns: {항목: (value, unit)} (찾은 항목만)
+    """
+    found: Dict[str, tuple] = {}
+    pending = [(kind, _LINE_BACKUPS[kind][0]) for kind in kinds]
+    num_cache: Dict[int, Optional[tuple]] = {}
+
+    def first_number(i: int) -> Optional[tuple]:
+        if i not in num_cache:
+            match = _RE_NUM_UNIT.search(lines[i]) if i < len(lines) else None
+            num_cache[i] = (float(match.group(1).replace(",", ".")), match.group(2) or None) if match else None
+        return num_cache[i]
+
+    for i, line in enumerate(lines):
+        line_lower = line.lower()
+        for kind, keywords in pending:
+            if kind in found or not any(kw in line_lower or kw in line for kw in keywords):
+                continue
+            # 같은 줄, 없으면 다음 줄에서 숫자 찾기
+            hit = first_number(i) or first_number(i + 1)
+            if hit:
+                value, unit = hit
+                found[kind] = (value, unit or _LINE_BACKUPS[kind][1] if value else unit)
+        if len(found) == len(pending):
+            break
+    return found
+
+
 def extract_value_unit(text: str, patterns: list) -> tuple:
     """
     여러 패턴으로 값과 단위 추출
@@ -358,6 +878,15 @@ def extract_value_unit(text: str, patterns: list) -> tuple:
     return None, None
 
 
+def extract_primary_nutrients(text: str) -> Dict[str, tuple]:
+    """
+    항목별 패턴 목록으로 기본 값 추출
+    (여러 항목 패턴을 하나로 합친 정규식은 re 가 키워드 접두어 빠른 탐색을 못 해 오히려 느리므로 항목별로 검색)
+    Returns: {항목: (value, unit)}
+    """
+    return {kind: extract_value_unit(text, patterns) for kind, patterns in _PRIMARY_NUTRIENT_PATTERNS.items()}
+
+
 def extract_nutrition_and_allergens(text: str) -> NutritionInfo:
     """
     OCR 텍스트에서 영양 정보 및 알레르기 유발 성분을 추출
@@ -367,35 +896,37 @@ def extract_nutrition_and_allergens(text: str) -> NutritionInfo:
     """
     # 텍스트 정규화
     norm_text = normalize_ocr_text(text)
-    norm_text = re.sub(r"\s+", " ", norm_text)
+    norm_text = _WS_RE.sub(" ", norm_text)
+    # 공백 제거 텍스트 (여러 항목의 압축 검색과 알레르기 검색에서 재사용)
+    norm_text_no_space = norm_text.replace(" ", "")
+    text_no_space = _WS_RE.sub("", text)
+    lines = text.split('\n')
+    
+    # 줄 단위 검색 결과 (처음 필요할 때 모든 항목을 한 번에 검색)
+    line_hits: Optional[Dict[str, float]] = None
+    
+    def line_value(name: str) -> Optional[float]:
+        nonlocal line_hits
+        if line_hits is None:
+            line_hits = scan_lines(lines)
+        return line_hits.get(name)
     
-    # 숫자 패턴 (정수 또는 소수)
-    num = r"(?P<value>\d+(?:[.,]\d+)?)"
+    # 항목별 기본 패턴 결과 (한 번의 스캔)
+    primary = extract_primary_nutrients(norm_text)
     
     # ========== 칼로리/열량 ==========
-    calories_patterns = [
-        re.compile(rf"(?:열량|에너지|칼로리|Calories?|Energy)\s*[:\-]?\s*{num}\s*(?P<unit>kcal|cal|kca1|킬로칼로리)?", re.IGNORECASE),
-        re.compile(rf"{num}\s*(?P<unit>kcal|kca1|Kcal|킬로칼로리)", re.IGNORECASE),
-        # 공백 없는 패턴
-        re.compile(rf"(?:열량|칼로리){num}(?P<unit>kcal)?", re.IGNORECASE),
-        # "당 192kcal" 패턴 (1봉지당, 1회 제공량당 등)
-        re.compile(rf"당\s*{num}\s*(?P<unit>kcal|kca1|Kcal)", re.IGNORECASE),
-        # "192 kcal" 단독 (kcal 앞 숫자)
-        re.compile(rf"(?<![0-9]){num}\s*(?P<unit>kcal|kca1|Kcal|킬로칼로리)", re.IGNORECASE),
-    ]
-    calories_value, calories_unit = extract_value_unit(norm_text, calories_patterns)
+    calories_value, calories_unit = primary["calories"]
     
     # 공백 없는 텍스트에서도 열량 재검색
     if calories_value is None:
-        text_compact = re.sub(r"\s+", "", norm_text)
-        cal_compact_match = re.search(r"열량(\d+(?:\.\d+)?)(kcal)?", text_compact, re.IGNORECASE)
+        cal_compact_match = _RE_CAL_COMPACT.search(norm_text_no_space)
         if cal_compact_match:
             calories_value = float(cal_compact_match.group(1))
             calories_unit = cal_compact_match.group(2) or "kcal"
     
     # 추가: "XXXkcal" 패턴 직접 검색 (열량 키워드 없이)
     if calories_value is None:
-        kcal_direct = re.search(r"(\d{2,4})\s*(?:kcal|kca1|Kcal)", norm_text, re.IGNORECASE)
+        kcal_direct = _RE_KCAL_DIRECT.search(norm_text)
         if kcal_direct:
             val = float(kcal_direct.group(1))
             if 50 <= val <= 1500:  # 합리적인 열량 범위
@@ -404,7 +935,7 @@ def extract_nutrition_and_allergens(text: str) -> NutritionInfo:
     
     # 추가: 공백 포함 "1 9 2 kcal" 패턴
     if calories_value is None:
-        spaced_kcal = re.search(r"(\d)\s*(\d)\s*(\d)\s*(?:kcal|kca1)", norm_text, re.IGNORECASE)
+        spaced_kcal = _RE_KCAL_SPACED.search(norm_text)
         if spaced_kcal:
             val = float(spaced_kcal.group(1) + spaced_kcal.group(2) + spaced_kcal.group(3))
             if 50 <= val <= 999:
@@ -413,100 +944,82 @@ def extract_nutrition_and_allergens(text: str) -> NutritionInfo:
     
     # 추가: "1g2 kcal" 패턴 (g가 9로 오인식된 경우)
     if calories_value is None or calories_value < 30:
-        kcal_g_pattern = re.search(r"(\d)[gㅇOo](\d)\s*(?:kcal|kca1|Kcal)", norm_text, re.IGNORECASE)
+        kcal_g_pattern = _RE_KCAL_G9.search(norm_text)
         if kcal_g_pattern:
             val = float(kcal_g_pattern.group(1) + "9" + kcal_g_pattern.group(2))
             if 50 <= val <= 999:
                 calories_value = val
                 calories_unit = "kcal"
-                print(f"[열량 추출] g→9 변환: {val}kcal")
+                logger.debug("[열량 추출] g→9 변환: %skcal", val)
     
     # 추가: 라인별로 "192kcal" 또는 "192 kcal" 찾기
     if calories_value is None or calories_value < 30:
-        for line in text.split('\n'):
-            kcal_line = re.search(r"(\d{2,3})\s*(?:kcal|kca1|Kcal|키)", line, re.IGNORECASE)
-            if kcal_line:
-                val = float(kcal_line.group(1))
-                if 50 <= val <= 999:
-                    calories_value = val
-                    calories_unit = "kcal"
-                    print(f"[열량 추출] 라인별: {val}kcal")
-                    break
+        val = line_value("calories")
+        if val is not None:
+            calories_value = val
+            calories_unit = "kcal"
+            logger.debug("[열량 추출] 라인별: %skcal", val)
     
     # 추가: "당 192" 패턴 (kcal 없이) - 1봉지당 뒤의 숫자
     if calories_value is None or calories_value < 30:
-        dang_pattern = re.search(r"[봉회]\s*지?\s*당\s*(\d{2,3})", norm_text, re.IGNORECASE)
+        dang_pattern = _RE_KCAL_DANG.search(norm_text)
         if dang_pattern:
             val = float(dang_pattern.group(1))
             if 50 <= val <= 999:
                 calories_value = val
                 calories_unit = "kcal"
-                print(f"[열량 추출] 당 패턴: {val}kcal")
+                logger.debug("[열량 추출] 당 패턴: %skcal", val)
     
     # 열량 값 보정: 너무 작은 값(30 미만)이면 텍스트에서 다시 검색
     if calories_value is not None and calories_value < 30:
         # 전체 텍스트에서 합리적인 kcal 값 찾기
-        all_kcal = re.findall(r"(\d{2,3})\s*(?:kcal|kca1|Kcal|키)", text, re.IGNORECASE)
-        for match in all_kcal:
-            val = float(match)
-            if 50 <= val <= 999:
-                print(f"[열량 보정] {calories_value} → {val}kcal")
-                calories_value = val
-                calories_unit = "kcal"
-                break
+        val = next((v for v in (float(m.group(1)) for m in _RE_KCAL_LINE.finditer(text)) if 50 <= v <= 999), None)
+        if val is not None:
+            logger.debug("[열량 보정] %s → %skcal", calories_value, val)
+            calories_value = val
+            calories_unit = "kcal"
     
     # ========== 탄수화물 ==========
-    carbs_patterns = [
-        re.compile(rf"(?:탄수화물|단수화물|탄수화믈|carbohydrate|carb)\s*[:\-]?\s*{num}\s*(?P<unit>g|mg|그램|%)?", re.IGNORECASE),
-    ]
-    carbs_value, carbs_unit = extract_value_unit(norm_text, carbs_patterns)
+    carbs_value, carbs_unit = primary["carbs"]
     
     # 공백 없는 텍스트에서도 탄수화물 재검색
     if carbs_value is None:
-        text_compact = re.sub(r"\s+", "", norm_text)
-        carbs_compact_match = re.search(r"[탄단]수화물(\d+(?:\.\d+)?)(g|mg)?", text_compact, re.IGNORECASE)
+        carbs_compact_match = _RE_CARBS_COMPACT.search(norm_text_no_space)
         if carbs_compact_match:
             carbs_value = float(carbs_compact_match.group(1))
             carbs_unit = carbs_compact_match.group(2) or "g"
     
     # 탄수화물 값 보정: 100 초과시 마지막 숫자(6,8,9)를 g로 간주하고 제거
     if carbs_value is not None and carbs_value > 100:
-        carbs_str = str(int(carbs_value))
-        if len(carbs_str) >= 2 and carbs_str[-1] in '6896':
-            corrected = float(carbs_str[:-1])
-            if 0 <= corrected <= 100:
-                print(f"[탄수화물 보정] {carbs_value} → {corrected}g")
-                carbs_value = corrected
-                carbs_unit = "g"
+        corrected = strip_misread_g(carbs_value, 0, 100)
+        if corrected is not None:
+            logger.debug("[탄수화물 보정] %s → %sg", carbs_value, corrected)
+            carbs_value = corrected
+            carbs_unit = "g"
     
     # 추가: 탄수화물 라인별 검색 (28g 9% 패턴)
     if carbs_value is None or carbs_value > 60:
-        for line in text.split('\n'):
-            # "탄수화물 28g" 또는 "탄 수 화 물 28 g" 패턴
-            carbs_line = re.search(r"[탄단]\s*수\s*화\s*물\s*(\d{1,2})\s*(?:g|8|9)", line, re.IGNORECASE)
-            if carbs_line:
-                val = float(carbs_line.group(1))
-                if 5 <= val <= 60:
-                    print(f"[탄수화물 추출] 라인별: {val}g")
-                    carbs_value = val
-                    carbs_unit = "g"
-                    break
+        # "탄수화물 28g" 또는 "탄 수 화 물 28 g" 패턴
+        val = line_value("carbs")
+        if val is not None:
+            logger.debug("[탄수화물 추출] 라인별: %sg", val)
+            carbs_value = val
+            carbs_unit = "g"
         
         # 압축 텍스트에서 "탄수화물28g" 패턴
         if carbs_value is None or carbs_value > 60:
-            text_compact = re.sub(r"\s+", "", text)
-            carbs_compact = re.search(r"[탄단]수화물(\d{1,2})[g89]", text_compact, re.IGNORECASE)
+            carbs_compact = _RE_CARBS_COMPACT_G.search(text_no_space)
             if carbs_compact:
                 val = float(carbs_compact.group(1))
                 if 5 <= val <= 60:
-                    print(f"[탄수화물 추출] 압축: {val}g")
+                    logger.debug("[탄수화물 추출] 압축: %sg", val)
                     carbs_value = val
                     carbs_unit = "g"
     
     # 탄수화물 값 보정: "20 8" → "28" (28g가 20 8로 분리된 경우)
     if carbs_value is not None and 15 <= carbs_value <= 25:
         # "탄수화물 20 8" 패턴 확인 (20 뒤에 8이 있으면 28로 합침)
-        carbs_208_match = re.search(r"[탄단]\s*수\s*화\s*물\s*(\d{1,2})\s*8", text, re.IGNORECASE)
+        carbs_208_match = _RE_CARBS_208.search(text)
         if carbs_208_match:
             first_num = int(carbs_208_match.group(1))
             if first_num == int(carbs_value) and first_num < 30:
@@ -515,207 +1028,159 @@ def extract_nutrition_and_allergens(text: str) -> NutritionInfo:
                 if str(first_num).endswith('0'):
                     corrected = int(str(first_num)[:-1] + '8')  # 20 → 28
                     if 20 <= corrected <= 50:
-                        print(f"[탄수화물 보정] {carbs_value} → {corrected}g (20 8 → 28)")
+                        logger.debug("[탄수화물 보정] %s → %sg (20 8 → 28)", carbs_value, corrected)
                         carbs_value = float(corrected)
                         carbs_unit = "g"
     
     # ========== 당류 ==========
-    sugar_patterns = [
-        # 기본 패턴: "당류 5g", "당료 2 g" (OCR 오타 포함)
-        re.compile(rf"(?:당류|당료|담류|당분|sugar|sugars)\s*[:\-]?\s*{num}\s*(?P<unit>g|mg|그램|%)?", re.IGNORECASE),
-        # "당류 5g" 또는 "당류: 5 g" 형태
-        re.compile(rf"(?:당류|당료|담류)\s*[:\-]?\s*{num}\s*(?P<unit>g|mg)?", re.IGNORECASE),
-        # 공백 없는 패턴: "당류5g"
-        re.compile(rf"(?:당류|당료|담류){num}(?P<unit>g|mg)?", re.IGNORECASE),
-    ]
-    sugar_value, sugar_unit = extract_value_unit(norm_text, sugar_patterns)
+    sugar_value, sugar_unit = primary["sugar"]
     
     # 공백 없는 텍스트에서도 당류 재검색
     if sugar_value is None:
-        text_compact = re.sub(r"\s+", "", norm_text)
-        sugar_compact_match = re.search(r"[당담][류료](\d+(?:\.\d+)?)(g|mg)?", text_compact, re.IGNORECASE)
+        sugar_compact_match = _RE_SUGAR_COMPACT.search(norm_text_no_space)
         if sugar_compact_match:
             sugar_value = float(sugar_compact_match.group(1))
             sugar_unit = sugar_compact_match.group(2) or "g"
     
     # 추가: "당류 13g 13%" 패턴 (g 앞의 숫자만 추출, % 무시)
     if sugar_value is None:
-        sugar_with_percent = re.search(r"[당담][류료]\s*(\d+(?:\.\d+)?)\s*g\s*\d+\s*%", norm_text, re.IGNORECASE)
+        sugar_with_percent = _RE_SUGAR_PCT.search(norm_text)
         if sugar_with_percent:
             sugar_value = float(sugar_with_percent.group(1))
             sugar_unit = "g"
     
     # 추가: 공백 있는 "당 류 13 g" 패턴
     if sugar_value is None:
-        sugar_spaced = re.search(r"[당담]\s*류\s*(\d+(?:\.\d+)?)\s*(?:g|그램)", norm_text, re.IGNORECASE)
+        sugar_spaced = _RE_SUGAR_SPACED.search(norm_text)
         if sugar_spaced:
             sugar_value = float(sugar_spaced.group(1))
             sugar_unit = "g"
     
     # 추가: "당류 13 13%" 패턴 (g 없이 숫자만 있는 경우, 첫번째 숫자가 당류값)
     if sugar_value is None:
-        sugar_num_only = re.search(r"[당담]\s*류[^0-9]*(\d{1,2})(?:\s+|\s*[^0-9])(\d{1,3})\s*%?", norm_text, re.IGNORECASE)
+        sugar_num_only = _RE_SUGAR_NUM_ONLY.search(norm_text)
         if sugar_num_only:
             val = float(sugar_num_only.group(1))
             if 0 <= val <= 50:  # 당류 합리적 범위
                 sugar_value = val
                 sugar_unit = "g"
-                print(f"[당류 추출] 숫자만 패턴: {val}g")
+                logger.debug("[당류 추출] 숫자만 패턴: %sg", val)
     
     # 추가: "138" 패턴 (13g가 138로 인식된 경우, g→8)
     if sugar_value is None:
-        text_compact = re.sub(r"\s+", "", norm_text)
         # 당류 뒤에 오는 2-3자리 숫자에서 마지막 8을 g로 해석
-        sugar_g8_match = re.search(r"[당담][류료][^0-9]*(\d{1,2})8", text_compact, re.IGNORECASE)
+        sugar_g8_match = _RE_SUGAR_G8.search(norm_text_no_space)
         if sugar_g8_match:
             val = float(sugar_g8_match.group(1))
             if 0 <= val <= 50:
                 sugar_value = val
                 sugar_unit = "g"
-                print(f"[당류 추출] 8→g 변환: {val}g")
+                logger.debug("[당류 추출] 8→g 변환: %sg", val)
     
     # 당류 값 보정: 100 초과시 마지막 숫자(8,6,9)를 g로 간주하고 제거
     if sugar_value is not None and sugar_value > 50:
-        sugar_str = str(int(sugar_value))
-        if len(sugar_str) >= 2 and sugar_str[-1] in '8689':
-            corrected = float(sugar_str[:-1])
-            if 0 <= corrected <= 50:
-                print(f"[당류 보정] {sugar_value} → {corrected}g (마지막 숫자 제거)")
-                sugar_value = corrected
-                sugar_unit = "g"
+        corrected = strip_misread_g(sugar_value, 0, 50)
+        if corrected is not None:
+            logger.debug("[당류 보정] %s → %sg (마지막 숫자 제거)", sugar_value, corrected)
+            sugar_value = corrected
+            sugar_unit = "g"
     
     # ========== 단백질 ==========
-    protein_patterns = [
-        re.compile(rf"(?:단백질|protein)\s*[:\-]?\s*{num}\s*(?P<unit>g|mg|그램|%)?", re.IGNORECASE),
-    ]
-    protein_value, protein_unit = extract_value_unit(norm_text, protein_patterns)
+    protein_value, protein_unit = primary["protein"]
     
     # 공백 제거 후 단백질 재검색
     if protein_value is None:
-        text_compact = re.sub(r"\s+", "", norm_text)
         # "단백질2g4%" 패턴 - 퍼센트 앞의 숫자가 아닌 g 앞의 숫자
-        protein_match = re.search(r"단백질(\d+(?:\.\d+)?)\s*g", text_compact, re.IGNORECASE)
+        protein_match = _RE_PROTEIN_COMPACT.search(norm_text_no_space)
         if protein_match:
             protein_value = float(protein_match.group(1))
             protein_unit = "g"
     
     # ========== 지방 ==========
-    fat_patterns = [
-        re.compile(rf"(?:지방|시방|fat|total\s*fat)\s*[:\-]?\s*{num}\s*(?P<unit>g|mg|그램|%)?", re.IGNORECASE),
-    ]
-    fat_value, fat_unit = extract_value_unit(norm_text, fat_patterns)
+    fat_value, fat_unit = primary["fat"]
     
     # 공백 제거 후 지방 재검색 (포화지방, 트랜스지방 제외)
     if fat_value is None:
-        text_compact = re.sub(r"\s+", "", norm_text)
         # "지방9g17%", "시방88" - 포화지방/트랜스지방 제외
-        fat_match = re.search(r"(?<!포화)(?<!트랜스)(?<!스)[지시]방(\d+(?:\.\d+)?)\s*g?", text_compact, re.IGNORECASE)
+        fat_match = _RE_FAT_COMPACT.search(norm_text_no_space)
         if fat_match:
             fat_value = float(fat_match.group(1))
             fat_unit = "g"
     
     # 지방 값 보정: 지방 8g가 88로 인식된 경우
     if fat_value is not None and fat_value > 50:
-        fat_str = str(int(fat_value))
-        if len(fat_str) >= 2 and fat_str[-1] in '8689':
-            corrected = float(fat_str[:-1])
-            if 0 <= corrected <= 50:
-                print(f"[지방 보정] {fat_value} → {corrected}g")
-                fat_value = corrected
-                fat_unit = "g"
+        corrected = strip_misread_g(fat_value, 0, 50)
+        if corrected is not None:
+            logger.debug("[지방 보정] %s → %sg", fat_value, corrected)
+            fat_value = corrected
+            fat_unit = "g"
     
     # 추가: 라인별로 "지방 8g" 패턴 찾기
     if fat_value is None or fat_value < 5:
-        for line in text.split('\n'):
-            # "지방 8g 15%" 패턴 - 포화지방/트랜스지방 제외
-            if '포화' not in line and '트랜스' not in line:
-                fat_line = re.search(r"[지시]방\s*(\d+(?:\.\d+)?)\s*(?:g|8)\s*\d*\s*%?", line, re.IGNORECASE)
-                if fat_line:
-                    val = float(fat_line.group(1))
-                    if 3 <= val <= 50:
-                        print(f"[지방 추출] 라인별: {val}g")
-                        fat_value = val
-                        fat_unit = "g"
-                        break
+        # "지방 8g 15%" 패턴 - 포화지방/트랜스지방 제외
+        val = line_value("fat")
+        if val is not None:
+            logger.debug("[지방 추출] 라인별: %sg", val)
+            fat_value = val
+            fat_unit = "g"
     
     # 추가: "시방 88" 패턴 (지방 8g가 시방 88로 인식)
     if fat_value is None or fat_value < 5:
-        fat_88 = re.search(r"[지시]방\s*(\d)8\s*1[59]", norm_text, re.IGNORECASE)  # "시방 88 15%" 패턴
+        fat_88 = _RE_FAT_88.search(norm_text)  # "시방 88 15%" 패턴
         if fat_88:
             val = float(fat_88.group(1))
             if 3 <= val <= 20:
-                print(f"[지방 추출] 88패턴: {val}g")
+                logger.debug("[지방 추출] 88패턴: %sg", val)
                 fat_value = val
                 fat_unit = "g"
     
     # 추가: 압축 텍스트에서 지방 찾기
     if fat_value is None or fat_value < 5:
-        text_compact = re.sub(r"\s+", "", text)
         # "지방8g15%" 또는 "시방8815%"
-        fat_compact = re.search(r"(?<!포화)(?<!트랜스)[지시]방(\d)[g8]?1[59]", text_compact, re.IGNORECASE)
+        fat_compact = _RE_FAT_COMPACT_PCT.search(text_no_space)
         if fat_compact:
             val = float(fat_compact.group(1))
             if 3 <= val <= 20:
-                print(f"[지방 추출] 압축: {val}g")
+                logger.debug("[지방 추출] 압축: %sg", val)
                 fat_value = val
                 fat_unit = "g"
     
     # ========== 포화지방 ==========
-    sat_fat_patterns = [
-        re.compile(rf"(?:포화지방|포화\s*지방|saturated\s*fat)\s*[:\-]?\s*{num}\s*(?P<unit>g|mg|그램|%)?", re.IGNORECASE),
-    ]
-    saturated_fat_value, saturated_fat_unit = extract_value_unit(norm_text, sat_fat_patterns)
+    saturated_fat_value, saturated_fat_unit = primary["saturated_fat"]
     
     # ========== 트랜스지방 ==========
-    trans_fat_patterns = [
-        re.compile(rf"(?:트랜스지방|트랜스\s*지방|트스지방|트렌스지방|trans\s*fat)\s*[:\-]?\s*{num}\s*(?P<unit>g|mg|그램|%)?", re.IGNORECASE),
-    ]
-    trans_fat_value, trans_fat_unit = extract_value_unit(norm_text, trans_fat_patterns)
+    trans_fat_value, trans_fat_unit = primary["trans_fat"]
     
     # ========== 콜레스테롤 ==========
-    cholesterol_patterns = [
-        re.compile(rf"(?:콜레스테롤|플레스로|콜레스로|cholesterol)\s*[:\-]?\s*{num}\s*(?P<unit>mg|g|%)?", re.IGNORECASE),
-    ]
-    cholesterol_value, cholesterol_unit = extract_value_unit(norm_text, cholesterol_patterns)
+    cholesterol_value, cholesterol_unit = primary["cholesterol"]
     
     # ========== 나트륨 ==========
-    sodium_patterns = [
-        # 기본 패턴: "나트륨 150mg", "나트륨: 150 mg", "나트룹 150 mg"
-        re.compile(rf"(?:나트륨|나트름|나트류|나트룹|나트룸|sodium)\s*[:\-]?\s*{num}\s*(?P<unit>mg|g|%)?", re.IGNORECASE),
-        # 숫자 먼저 오는 패턴: "150mg 나트륨"
-        re.compile(rf"{num}\s*(?P<unit>mg|g)\s*(?:나트륨|나트름|나트룹|sodium)", re.IGNORECASE),
-        # 공백 없는 패턴: "나트륨150mg"
-        re.compile(rf"(?:나트륨|나트름|나트룹){num}(?P<unit>mg|g)?", re.IGNORECASE),
-        # Na 패턴
-        re.compile(rf"Na\s*[:\-]?\s*{num}\s*(?P<unit>mg|g)?", re.IGNORECASE),
-    ]
-    sodium_value, sodium_unit = extract_value_unit(norm_text, sodium_patterns)
+    sodium_value, sodium_unit = primary["sodium"]
     
     # 공백 없는 텍스트에서도 나트륨 재검색
     if sodium_value is None:
-        text_compact = re.sub(r"\s+", "", norm_text)
-        sodium_compact_match = re.search(r"나트[륨름류룹룸](\d+(?:\.\d+)?)(mg|g)?", text_compact, re.IGNORECASE)
+        sodium_compact_match = _RE_SODIUM_COMPACT.search(norm_text_no_space)
         if sodium_compact_match:
             sodium_value = float(sodium_compact_match.group(1))
             sodium_unit = sodium_compact_match.group(2) or "mg"
     
     # 추가: "나트륨 160mg 8%" 패턴 (mg 앞의 숫자만 추출, % 무시)
     if sodium_value is None:
-        sodium_with_percent = re.search(r"나트[륨름류룹룸]\s*(\d+(?:\.\d+)?)\s*mg\s*\d+\s*%", norm_text, re.IGNORECASE)
+        sodium_with_percent = _RE_SODIUM_PCT.search(norm_text)
         if sodium_with_percent:
             sodium_value = float(sodium_with_percent.group(1))
             sodium_unit = "mg"
     
     # 추가: 공백 있는 "나 트 륨 160 mg" 패턴
     if sodium_value is None:
-        sodium_spaced = re.search(r"나\s*트\s*[륨름류]\s*(\d+(?:\.\d+)?)\s*(?:mg|밀리그램)", norm_text, re.IGNORECASE)
+        sodium_spaced = _RE_SODIUM_SPACED.search(norm_text)
         if sodium_spaced:
             sodium_value = float(sodium_spaced.group(1))
             sodium_unit = "mg"
     
     # 추가: "트륨 160mg" 패턴 (나 가 잘려서 인식된 경우)
     if sodium_value is None:
-        sodium_partial = re.search(r"트[륨름류]\s*(\d+(?:\.\d+)?)\s*(?:mg|밀리그램)", norm_text, re.IGNORECASE)
+        sodium_partial = _RE_SODIUM_PARTIAL.search(norm_text)
         if sodium_partial:
             val = float(sodium_partial.group(1))
             if 10 <= val <= 5000:  # 나트륨 합리적 범위
@@ -725,37 +1190,32 @@ def extract_nutrition_and_allergens(text: str) -> NutritionInfo:
     # 추가: "XXXmg" 패턴 (나트륨 키워드 없이, mg 앞의 3자리 숫자)
     if sodium_value is None:
         # 100~999mg 범위의 숫자 + mg 패턴
-        sodium_mg_only = re.search(r"(\d{2,3})\s*mg\s*\d*\s*%?", norm_text, re.IGNORECASE)
+        sodium_mg_only = _RE_SODIUM_MG_ONLY.search(norm_text)
         if sodium_mg_only:
             val = float(sodium_mg_only.group(1))
             if 50 <= val <= 999:  # 나트륨 합리적 범위
                 sodium_value = val
                 sodium_unit = "mg"
-                print(f"[나트륨 추출] mg만 패턴: {val}mg")
+                logger.debug("[나트륨 추출] mg만 패턴: %smg", val)
     
     # 추가: "16008" 패턴 (160mg 8%가 16008로 합쳐진 경우)
     if sodium_value is None:
-        text_compact = re.sub(r"\s+", "", norm_text)
         # 나트륨 근처의 큰 숫자에서 앞 3자리 추출
-        sodium_big_match = re.search(r"[나트][트륨름류룹]?[^0-9]*(\d{3})(\d{1,2})\d*", text_compact, re.IGNORECASE)
+        sodium_big_match = _RE_SODIUM_BIG.search(norm_text_no_space)
         if sodium_big_match:
             val = float(sodium_big_match.group(1))
             if 100 <= val <= 500:  # 일반 식품 나트륨 범위
                 sodium_value = val
                 sodium_unit = "mg"
-                print(f"[나트륨 추출] 큰숫자 분리: {val}mg")
+                logger.debug("[나트륨 추출] 큰숫자 분리: %smg", val)
     
     # 추가: 라인별로 "160mg" 찾기
     if sodium_value is None:
-        for line in text.split('\n'):
-            mg_match = re.search(r"(\d{2,3})\s*mg", line, re.IGNORECASE)
-            if mg_match:
-                val = float(mg_match.group(1))
-                if 50 <= val <= 999:
-                    sodium_value = val
-                    sodium_unit = "mg"
-                    print(f"[나트륨 추출] 라인별 mg: {val}mg")
-                    break
+        val = line_value("sodium")
+        if val is not None:
+            sodium_value = val
+            sodium_unit = "mg"
+            logger.debug("[나트륨 추출] 라인별 mg: %smg", val)
     
     # 나트륨 값 보정: 5000 초과시 앞 3자리만 추출 (140mg7% → 14007 → 140)
     if sodium_value is not None and sodium_value > 1000:
@@ -764,329 +1224,173 @@ def extract_nutrition_and_allergens(text: str) -> NutritionInfo:
             # 앞 3자리 추출 (14007 → 140)
             corrected = float(sodium_str[:3])
             if 50 <= corrected <= 999:
-                print(f"[나트륨 보정] {sodium_value} → {corrected}mg (앞 3자리)")
+                logger.debug("[나트륨 보정] %s → %smg (앞 3자리)", sodium_value, corrected)
                 sodium_value = corrected
                 sodium_unit = "mg"
     
     # 추가: "140mg7%" 패턴 직접 검색 (mg 뒤에 %가 붙어있는 경우)
     if sodium_value is None:
-        sodium_mg_percent = re.search(r"(\d{2,3})mg\d{1,2}%", text.replace(" ", ""), re.IGNORECASE)
+        sodium_mg_percent = _RE_SODIUM_MG_PCT.search(text.replace(" ", ""))
         if sodium_mg_percent:
             val = float(sodium_mg_percent.group(1))
             if 50 <= val <= 999:
-                print(f"[나트륨 추출] mg%패턴: {val}mg")
+                logger.debug("[나트륨 추출] mg%%패턴: %smg", val)
                 sodium_value = val
                 sodium_unit = "mg"
     
     # ========== 1회 제공량 ==========
-    serving_match = re.search(
-        r"(?:1회\s*제공량|1회\s*섭취량|serving\s*size|총\s*내용량)[:\s]*([0-9]+(?:\.[0-9]+)?\s*(?:g|ml|mL|그램|밀리리터)?)",
-        norm_text, re.IGNORECASE
-    )
+    serving_match = _RE_SERVING.search(norm_text)
     serving_size = serving_match.group(1).strip() if serving_match else None
     
     # ========== 알레르기 유발 성분 ==========
     found_allergens = set()
     
-    # 원본 텍스트에서도 검색 (공백 제거 버전)
-    text_no_space = re.sub(r"\s+", "", text)
-    norm_text_no_space = re.sub(r"\s+", "", norm_text)
+    # 디버깅용 로그 여부 (꺼져 있으면 긴 텍스트 자르기·정렬도 하지 않음)
+    debug_log = logger.isEnabledFor(logging.DEBUG)
     
     # 디버깅: 알레르기 검색 대상 텍스트 출력
-    print(f"[알레르기 검색] 공백제거 텍스트 일부: {text_no_space[:500]}...")
+    if debug_log:
+        logger.debug("[알레르기 검색] 공백제거 텍스트 일부: %s...", text_no_space[:500])
     
     # 0. OCR 오타 보정 적용
-    allergen_search_text = norm_text
-    for typo, correct in ALLERGEN_TYPO_MAP.items():
-        allergen_search_text = allergen_search_text.replace(typo, correct)
-    allergen_search_no_space = re.sub(r"\s+", "", allergen_search_text)
+    allergen_search_text = apply_replace_phases(norm_text, _ALLERGEN_TYPO_PHASES)
+    allergen_search_no_space = allergen_search_text.replace(" ", "")  # norm_text 는 공백이 한 칸씩
     
-    print(f"[알레르기 검색] 오타보정 텍스트: {allergen_search_text[:300]}...")
+    if debug_log:
+        logger.debug("[알레르기 검색] 오타보정 텍스트: %s...", allergen_search_text[:300])
     
     # 1. 안전한 키워드(2글자 이상) - 전체 텍스트에서 검색
-    for kw in ALLERGEN_KEYWORDS_SAFE:
-        if kw in allergen_search_text or kw in allergen_search_no_space or kw in text_no_space:
-            print(f"[알레르기 발견] '{kw}' 감지!")
-            found_allergens.add(kw)
+    safe_hits = find_keywords(_SAFE_KEYWORD_AUTOMATON, allergen_search_text, allergen_search_no_space, text_no_space)
+    if debug_log:
+        for kw in in_keyword_order(safe_hits):
+            logger.debug("[알레르기 발견] '%s' 감지!", kw)
+    found_allergens.update(safe_hits)
     
     # 2. 알레르기 관련 섹션 패턴들 (더 확장)
-    allergen_section_patterns = [
-        r"(?:알[레러]르기|알[레러]지|allerg)[^:]*[:\s]*([^\n.。]{5,200})",
-        r"(?:함유|포함|contains?)[:\s]*([^\n.。]+)",
-        r"(?:이\s*제품은?|본\s*제품은?)[^\n.。]*(?:사용|제조|생산)[^\n.。]*",
-        r"(?:원재료|원료|원재료명)[:\s및]*([^\n]{10,500})",
-        r"[(\(]([^)\)]*(?:우유|대두|밀|계란|땅콩|견과|새우|게|오징어|조개)[^)\)]*)[)\)]",
-        r"(?:주의|경고|알림)[:\s]*([^\n.。]{5,200})",
-        r"(?:동일|같은)\s*(?:제조|생산|시설)[^\n.。]*",
-    ]
-    
-    for pattern in allergen_section_patterns:
-        matches = re.findall(pattern, allergen_search_text, re.IGNORECASE)
+    for section_re in _ALLERGEN_SECTION_RES:
+        matches = section_re.findall(allergen_search_text)
         for match in matches:
             section_text = match if isinstance(match, str) else " ".join(match)
-            section_no_space = re.sub(r"\s+", "", section_text)
+            section_no_space = _WS_RE.sub("", section_text)
             # 안전한 키워드 검색
-            for kw in ALLERGEN_KEYWORDS_SAFE:
-                if kw in section_text or kw in section_no_space:
-                    print(f"[알레르기 섹션발견] '{kw}' in section")
-                    found_allergens.add(kw)
+            section_hits = find_keywords(_SAFE_KEYWORD_AUTOMATON, section_text, section_no_space)
+            if debug_log:
+                for kw in in_keyword_order(section_hits):
+                    logger.debug("[알레르기 섹션발견] '%s' in section", kw)
+            found_allergens.update(section_hits)
             # 짧은 키워드는 명시적 알레르기 표시가 있는 섹션에서만 검출
-            has_explicit_allergen_marker = any(marker in section_text for marker in ["함유", "포함", "알레르기", "알러지"])
+            has_explicit_allergen_marker = any(marker in section_text for marker in _EXPLICIT_ALLERGEN_MARKERS)
             if has_explicit_allergen_marker:
-                for kw in ALLERGEN_KEYWORDS_SHORT:
+                for kw, short_re in _SHORT_KEYWORD_RES:
                     # 짧은 키워드가 단독으로 있거나 콤마/괄호로 구분된 경우만
-                    if re.search(rf"(?:^|[,，、\s(（])({kw})(?:[,，、\s)）]|$)", section_text):
-                        print(f"[알레르기 섹션발견-짧은] '{kw}' in section (명시적)")
+                    if short_re.search(section_text):
+                        logger.debug("[알레르기 섹션발견-짧은] '%s' in section (명시적)", kw)
                         found_allergens.add(kw)
     
     # 3. "OO 함유/포함" 패턴 (예: "우유 함유", "밀 포함") - 짧은 키워드도 허용
-    for suffix in ALLERGEN_CONTEXT_SUFFIXES:
-        contains_pattern = re.findall(rf"(\w{{1,10}})\s*{suffix}", allergen_search_text)
+    for suffix, suffix_re in _CONTEXT_SUFFIX_RES:
+        contains_pattern = suffix_re.findall(allergen_search_text)
         for item in contains_pattern:
-            if item in ALLERGEN_KEYWORDS_SAFE or item in ALLERGEN_KEYWORDS_SHORT:
-                print(f"[알레르기 문맥발견] '{item} {suffix}'")
+            if item in ALLERGEN_KEYWORD_SET:
+                logger.debug("[알레르기 문맥발견] '%s %s'", item, suffix)
                 found_allergens.add(item)
     
     # 4. 괄호 안 알레르기 표시 (예: "(우유, 대두, 밀 포함)")
-    paren_matches = re.findall(r"[(\(]([^)\)]+)[)\)]", allergen_search_text)
+    paren_matches = _RE_PAREN.findall(allergen_search_text)
     for paren_content in paren_matches:
-        paren_no_space = re.sub(r"\s+", "", paren_content)
+        paren_no_space = _WS_RE.sub("", paren_content)
         # 괄호 안에 알레르기 관련 키워드가 있으면 짧은 키워드도 검출
-        has_allergen_context = any(kw in paren_content for kw in ["함유", "포함", "알레르기", "알러지", "주의"])
-        for kw in ALLERGEN_KEYWORDS_SAFE:
-            if kw in paren_content or kw in paren_no_space:
-                print(f"[알레르기 괄호발견] '{kw}' in ({paren_content[:30]}...)")
-                found_allergens.add(kw)
+        has_allergen_context = any(kw in paren_content for kw in _PAREN_ALLERGEN_MARKERS)
+        paren_hits = find_keywords(_SAFE_KEYWORD_AUTOMATON, paren_content, paren_no_space)
+        if debug_log:
+            for kw in in_keyword_order(paren_hits):
+                logger.debug("[알레르기 괄호발견] '%s' in (%s...)", kw, paren_content[:30])
+        found_allergens.update(paren_hits)
         if has_allergen_context:
-            for kw in ALLERGEN_KEYWORDS_SHORT:
-                if kw in paren_content:
-                    found_allergens.add(kw)
+            found_allergens.update(find_keywords(_SHORT_KEYWORD_AUTOMATON, paren_content))
     
     # 5. 콤마/슬래시로 분리된 원재료 목록에서 검색 (안전한 키워드만)
-    ingredient_list_patterns = [
-        r"원재료[명]?[:\s및]*(.+?)(?:영양|내용|유통|보관|주의|$)",
-        r"재료[:\s]*(.+?)(?:영양|내용|유통|보관|$)",
-    ]
-    for pattern in ingredient_list_patterns:
-        match = re.search(pattern, allergen_search_text, re.DOTALL | re.IGNORECASE)
+    for ingredient_re in _INGREDIENT_LIST_RES:
+        match = ingredient_re.search(allergen_search_text)
         if match:
             ingredients = match.group(1)
             # 콤마, 슬래시, 괄호 등으로 분리
-            items = re.split(r"[,，、/·\s]+", ingredients)
-            for item in items:
-                item = item.strip()
-                # 안전한 키워드만 원재료에서 검출
-                for kw in ALLERGEN_KEYWORDS_SAFE:
-                    if kw in item:
-                        print(f"[알레르기 원재료발견] '{kw}' in '{item}'")
-                        found_allergens.add(kw)
-    
-    # 6. 직접 텍스트에서 주요 알레르겐 재검색 (OCR 오류 대비)
-    # 2글자 이상만 포함 (1글자는 오탐 발생)
-    major_allergens_check = ["오징어", "새우", "꽃게", "대게", "조개", "우유", "계란", "대두", "땅콩", "호두", "아몬드", "밀가루", "글루텐"]
-    for allergen in major_allergens_check:
-        # 띄어쓰기 무시 검색
-        if allergen in text_no_space or allergen in norm_text_no_space:
-            if allergen not in found_allergens:
-                print(f"[알레르기 최종검색] '{allergen}' 추가 발견!")
-                found_allergens.add(allergen)
+            items = [item.strip() for item in _RE_SPLIT_ITEMS.split(ingredients)]
+            # 안전한 키워드만 원재료에서 검출
+            if debug_log:
+                for item in items:
+                    for kw in in_keyword_order(find_keywords(_SAFE_KEYWORD_AUTOMATON, item)):
+                        logger.debug("[알레르기 원재료발견] '%s' in '%s'", kw, item)
+            found_allergens.update(find_keywords(_SAFE_KEYWORD_AUTOMATON, *items))
+    
+    # 6. 직접 텍스트에서 주요 알레르겐 재검색 (OCR 오류 대비, 띄어쓰기 무시)
+    major_hits = find_keywords(_MAJOR_ALLERGEN_AUTOMATON, text_no_space, norm_text_no_space) - found_allergens
+    if debug_log:
+        for allergen in MAJOR_ALLERGENS_CHECK:
+            if allergen in major_hits:
+                logger.debug("[알레르기 최종검색] '%s' 추가 발견!", allergen)
+    found_allergens.update(major_hits)
     
     found_allergens = sorted(found_allergens) if found_allergens else None
-    print(f"[알레르기 최종] {found_allergens}")
+    logger.debug("[알레르기 최종] %s", found_allergens)
     
     # ========== 백업 추출: 줄 단위 분석 ==========
     # 패턴 매칭이 실패한 경우, 줄 단위로 키워드와 숫자를 찾음
-    lines = text.split('\n')
-    
-    def find_number_near_keyword(lines: list, keywords: list) -> tuple:
-        """키워드가 있는 줄 또는 인접 줄에서 숫자 찾기"""
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            for kw in keywords:
-                if kw in line_lower or kw in line:
-                    # 같은 줄에서 숫자 찾기
-                    nums = re.findall(r'(\d+(?:[.,]\d+)?)\s*(mg|g|kcal|%)?', line)
-                    if nums:
-                        try:
-                            val = float(nums[0][0].replace(',', '.'))
-                            unit = nums[0][1] if nums[0][1] else None
-                            return val, unit
-                        except:
-                            pass
-                    # 다음 줄에서 숫자 찾기
-                    if i + 1 < len(lines):
-                        nums = re.findall(r'(\d+(?:[.,]\d+)?)\s*(mg|g|kcal|%)?', lines[i+1])
-                        if nums:
-                            try:
-                                val = float(nums[0][0].replace(',', '.'))
-                                unit = nums[0][1] if nums[0][1] else None
-                                return val, unit
-                            except:
-                                pass
-        return None, None
-    
-    # 백업: 나트륨
-    if sodium_value is None:
-        sodium_value, sodium_unit = find_number_near_keyword(
-            lines, ['나트륨', '나트룹', '나트름', 'sodium', 'na']
-        )
-        if sodium_unit is None and sodium_value:
-            sodium_unit = 'mg'
-    
-    # 백업: 당류
-    if sugar_value is None:
-        sugar_value, sugar_unit = find_number_near_keyword(
-            lines, ['당류', '당료', 'sugar']
-        )
-        if sugar_unit is None and sugar_value:
-            sugar_unit = 'g'
-    
-    # 백업: 탄수화물
-    if carbs_value is None:
-        carbs_value, carbs_unit = find_number_near_keyword(
-            lines, ['탄수화물', '단수화물', 'carb']
-        )
-        if carbs_unit is None and carbs_value:
-            carbs_unit = 'g'
-    
-    # 백업: 단백질
-    if protein_value is None:
-        protein_value, protein_unit = find_number_near_keyword(
-            lines, ['단백질', 'protein']
-        )
-        if protein_unit is None and protein_value:
-            protein_unit = 'g'
     
-    # 백업: 지방
-    if fat_value is None:
-        fat_value, fat_unit = find_number_near_keyword(
-            lines, ['지방', 'fat']
-        )
-        if fat_unit is None and fat_value:
-            fat_unit = 'g'
-    
-    # 백업: 열량
-    if calories_value is None:
-        calories_value, calories_unit = find_number_near_keyword(
-            lines, ['열량', '칼로리', 'calorie', 'kcal', 'energy']
-        )
-        if calories_unit is None and calories_value:
-            calories_unit = 'kcal'
-    
-    # ========== 최종 백업: 공백 완전 제거 후 패턴 찾기 ==========
-    full_text = " ".join(lines)
-    # 공백, 특수문자 제거한 텍스트
-    compact_text = re.sub(r'[\s\|\[\]\{\}\(\)\-_~]', '', text)
-    print(f"[영양분석-압축] {compact_text[:500]}...")
-    
-    # 압축 텍스트에서 영양성분 추출 (최우선)
-    # 패턴: 키워드 + 숫자 + 단위 + 퍼센트
-    def extract_from_compact(keyword_pattern, text_to_search):
-        """압축 텍스트에서 '키워드숫자g퍼센트' 패턴 추출"""
-        # 예: 당류25g25% → 25 추출
-        pattern = rf'{keyword_pattern}(\d+(?:\.\d+)?)\s*[gG]?\s*\d*%?'
-        match = re.search(pattern, text_to_search, re.IGNORECASE)
-        if match:
-            try:
-                return float(match.group(1)), 'g'
-            except:
-                pass
-        return None, None
-    
-    def extract_mg_from_compact(keyword_pattern, text_to_search):
-        """압축 텍스트에서 mg 단위 추출"""
-        pattern = rf'{keyword_pattern}(\d+(?:\.\d+)?)\s*(?:mg|m[gG9])?'
-        match = re.search(pattern, text_to_search, re.IGNORECASE)
-        if match:
-            try:
-                return float(match.group(1)), 'mg'
-            except:
-                pass
-        return None, None
-    
-    # 나트륨 (압축 텍스트)
-    if sodium_value is None:
-        sodium_value, sodium_unit = extract_mg_from_compact(r'나트[륨름룹류]', compact_text)
-        if sodium_value:
-            print(f"[압축추출] 나트륨: {sodium_value}mg")
-    
-    # 당류 (압축 텍스트)
-    if sugar_value is None:
-        sugar_value, sugar_unit = extract_from_compact(r'당[류료]', compact_text)
-        if sugar_value:
-            print(f"[압축추출] 당류: {sugar_value}g")
-    
-    # 탄수화물 (압축 텍스트)
-    if carbs_value is None:
-        carbs_value, carbs_unit = extract_from_compact(r'탄수화물', compact_text)
-        if carbs_value:
-            print(f"[압축추출] 탄수화물: {carbs_value}g")
-    
-    # 단백질 (압축 텍스트)
-    if protein_value is None:
-        protein_value, protein_unit = extract_from_compact(r'단백질', compact_text)
-        if protein_value:
-            print(f"[압축추출] 단백질: {protein_value}g")
-    
-    # 지방 (압축 텍스트) - 포화지방, 트랜스지방 제외
-    if fat_value is None:
-        # "지방" 앞에 "포화", "트랜스"가 없는 경우만
-        fat_match = re.search(r'(?<!포화)(?<!트랜스)(?<!스)지방(\d+(?:\.\d+)?)\s*[gG]?', compact_text)
-        if fat_match:
-            try:
-                fat_value = float(fat_match.group(1))
-                fat_unit = 'g'
-                print(f"[압축추출] 지방: {fat_value}g")
-            except:
-                pass
-    
-    # 열량 (압축 텍스트)
-    if calories_value is None:
-        cal_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:kcal|kca1|킬로칼로리|Kcal)', compact_text, re.IGNORECASE)
-        if cal_match:
-            try:
-                calories_value = float(cal_match.group(1))
-                calories_unit = 'kcal'
-                print(f"[압축추출] 열량: {calories_value}kcal")
-            except:
-                pass
-    
-    # ========== 기존 백업: 숫자+단위 패턴으로 직접 찾기 ==========
-    # 열량: 숫자 + kcal 패턴
-    if calories_value is None:
-        kcal_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:kcal|kca1|Kcal|킬로칼로리)', full_text, re.IGNORECASE)
-        if kcal_match:
-            calories_value = float(kcal_match.group(1))
-            calories_unit = 'kcal'
-    
-    # 나트륨: 숫자(100이상) + mg 패턴 (나트륨은 보통 100mg 이상)
-    if sodium_value is None:
-        # "숫자 mg" 패턴 중 나트륨일 가능성이 높은 것 찾기
-        mg_matches = re.findall(r'(\d+(?:\.\d+)?)\s*mg', full_text, re.IGNORECASE)
-        for match in mg_matches:
-            val = float(match)
-            # 50-2000mg 범위는 나트륨일 가능성 높음
-            if 50 <= val <= 2000 and sodium_value is None:
-                sodium_value = val
-                sodium_unit = 'mg'
-                break
-    
-    # 탄수화물: 숫자 + g 패턴 중 10-100 범위
-    if carbs_value is None:
-        g_matches = re.findall(r'(\d+(?:\.\d+)?)\s*g\b', full_text, re.IGNORECASE)
-        for match in g_matches:
-            val = float(match)
-            # 10-100g 범위는 탄수화물일 가능성
-            if 10 <= val <= 100 and carbs_value is None:
-                carbs_value = val
-                carbs_unit = 'g'
-                break
+    # 1단계 패턴 매칭으로 다 찾은 라벨은 백업 단계(텍스트 가공·재검색)를 통째로 건너뜀
+    if None in (sodium_value, sugar_value, carbs_value, protein_value, fat_value, calories_value):
+        backups = dict(zip(_BACKUP_KINDS, (
+            (sodium_value, sodium_unit), (sugar_value, sugar_unit), (carbs_value, carbs_unit),
+            (protein_value, protein_unit), (fat_value, fat_unit), (calories_value, calories_unit),
+        )))
+        missing = [kind for kind in _BACKUP_KINDS if backups[kind][0] is None]
+        backups.update(find_numbers_near_keywords(lines, missing))
+    
+        # ========== 최종 백업: 공백 완전 제거 후 패턴 찾기 ==========
+        # 아래 백업들은 모두 비어 있는 항목에만 적용되므로, 다 채워졌으면 텍스트 가공도 건너뜀
+        missing = [kind for kind in _BACKUP_KINDS if backups[kind][0] is None]
+        if missing:
+            # 공백, 특수문자 제거한 텍스트
+            compact_text = _RE_COMPACT_STRIP.sub('', text)
+            if debug_log:
+                logger.debug("[영양분석-압축] %s...", compact_text[:500])
+            # 압축 텍스트에서 영양성분 추출 (최우선)
+            # 패턴: 키워드 + 숫자 + 단위 + 퍼센트
+            backups.update(scan_compact(compact_text, missing))
+    
+        (
+            (sodium_value, sodium_unit), (sugar_value, sugar_unit), (carbs_value, carbs_unit),
+            (protein_value, protein_unit), (fat_value, fat_unit), (calories_value, calories_unit),
+        ) = (backups[kind] for kind in _BACKUP_KINDS)
+    
+        # ========== 기존 백업: 숫자+단위 패턴으로 직접 찾기 ==========
+        # 열량: 숫자 + kcal 중 첫 값
+        # 나트륨: 숫자 + mg 중 50-2000 범위 (나트륨은 보통 100mg 이상)
+        # 탄수화물: 숫자 + g 중 10-100 범위
+        # (줄바꿈도 공백처럼 \s, \b 에 걸리므로 줄을 합치지 않고 원문 그대로 검색)
+        if None in (calories_value, sodium_value, carbs_value):
+            for match in _RE_FULL_UNITS.finditer(text):
+                val = float(match.group(1))
+                unit = match.lastgroup
+                if unit == "kcal":
+                    if calories_value is None:
+                        calories_value = val
+                        calories_unit = 'kcal'
+                elif unit == "mg":
+                    if sodium_value is None and 50 <= val <= 2000:
+                        sodium_value = val
+                        sodium_unit = 'mg'
+                elif carbs_value is None and 10 <= val <= 100:
+                    carbs_value = val
+                    carbs_unit = 'g'
+                if None not in (calories_value, sodium_value, carbs_value):
+                    break
     
     # ========== 비정상 값 필터링 ==========
     # 식품 영양정보의 합리적 범위를 벗어난 값은 OCR 오류로 간주
     def validate_range(value, max_val, name):
         if value is not None and value > max_val:
-            print(f"[값 필터링] {name}: {value} > {max_val} (비정상, 무시)")
+            logger.debug("[값 필터링] %s: %s > %s (비정상, 무시)", name, value, max_val)
             return None
         return value
     
@@ -1130,12 +1434,12 @@ def extract_nutrition_and_allergens_english(text: str) -> NutritionInfo:
     """
     영어 영양정보 라벨에서 추출
     """
-    norm_text = re.sub(r"\s+", " ", text.lower())
+    norm_text = _WS_RE.sub(" ", text.lower())
     
-    # 영어 패턴 정의
+    # 패턴 목록에서 첫 매치 추출
     def extract_en(patterns):
         for pattern in patterns:
-            match = re.search(pattern, norm_text, re.IGNORECASE)
+            match = pattern.search(norm_text)
             if match:
                 try:
                     value = float(match.group(1).replace(",", "."))
@@ -1146,66 +1450,38 @@ def extract_nutrition_and_allergens_english(text: str) -> NutritionInfo:
         return None, None
     
     # Calories
-    cal_value, cal_unit = extract_en([
-        r"calories?\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(kcal|cal)?",
-        r"energy\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(kcal|kj)?",
-    ])
+    cal_value, cal_unit = extract_en(_EN_NUTRIENT_PATTERNS["calories"])
     
     # Carbohydrates
-    carbs_value, carbs_unit = extract_en([
-        r"(?:total\s+)?carbohydrate[s]?\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",
-        r"carbs?\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",
-    ])
+    carbs_value, carbs_unit = extract_en(_EN_NUTRIENT_PATTERNS["carbs"])
     
     # Sugar
-    sugar_value, sugar_unit = extract_en([
-        r"(?:total\s+)?sugar[s]?\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",
-    ])
+    sugar_value, sugar_unit = extract_en(_EN_NUTRIENT_PATTERNS["sugar"])
     
     # Protein
-    protein_value, protein_unit = extract_en([
-        r"protein[s]?\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",
-    ])
+    protein_value, protein_unit = extract_en(_EN_NUTRIENT_PATTERNS["protein"])
     
     # Fat
-    fat_value, fat_unit = extract_en([
-        r"(?:total\s+)?fat\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",
-    ])
+    fat_value, fat_unit = extract_en(_EN_NUTRIENT_PATTERNS["fat"])
     
     # Saturated Fat
-    sat_fat_value, sat_fat_unit = extract_en([
-        r"saturated\s*fat\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",
-    ])
+    sat_fat_value, sat_fat_unit = extract_en(_EN_NUTRIENT_PATTERNS["saturated_fat"])
     
     # Trans Fat
-    trans_fat_value, trans_fat_unit = extract_en([
-        r"trans\s*fat\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(g|mg)?",
-    ])
+    trans_fat_value, trans_fat_unit = extract_en(_EN_NUTRIENT_PATTERNS["trans_fat"])
     
     # Cholesterol
-    chol_value, chol_unit = extract_en([
-        r"cholesterol\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(mg|g)?",
-    ])
+    chol_value, chol_unit = extract_en(_EN_NUTRIENT_PATTERNS["cholesterol"])
     
     # Sodium
-    sodium_value, sodium_unit = extract_en([
-        r"sodium\s*[:\-]?\s*(\d+(?:[.,]\d+)?)\s*(mg|g)?",
-    ])
-    
-    # 영어 알레르기 성분
-    en_allergens = [
-        "milk", "egg", "peanut", "tree nut", "soy", "wheat", "fish", "shellfish",
-        "sesame", "gluten", "lactose", "almond", "walnut", "cashew", "hazelnut",
-        "pecan", "pistachio", "macadamia", "shrimp", "crab", "lobster", "clam",
-        "oyster", "squid", "octopus", "mussel", "scallop"
-    ]
+    sodium_value, sodium_unit = extract_en(_EN_NUTRIENT_PATTERNS["sodium"])
     
     found = []
-    allergen_section = re.search(r"(?:contains|allergen|allergy)[:\s]+(.+?)(?:\.|$)", norm_text, re.IGNORECASE)
+    allergen_section = _RE_EN_ALLERGEN_SECTION.search(norm_text)
     search_text = allergen_section.group(1) if allergen_section else norm_text
     
-    for allergen in en_allergens:
-        if re.search(rf"\b{allergen}\b", search_text, re.IGNORECASE):
+    for allergen, allergen_re in _EN_ALLERGEN_RES:
+        if allergen_re.search(search_text):
             found.append(allergen)
     
     return NutritionInfo(
@@ -1232,80 +1508,298 @@ def extract_nutrition_and_allergens_english(text: str) -> NutritionInfo:
     )
 
 
+# 필드 이름/값 추출기를 한 번만 만들어 둠 (asdict 의 재귀 복사 없이 dict 생성)
+_NUTRITION_FIELDS = tuple(f.name for f in fields(NutritionInfo))
+_NUTRITION_GETTER = attrgetter(*_NUTRITION_FIELDS)
+
+
 def merge_nutrition(primary: NutritionInfo, secondary: NutritionInfo) -> NutritionInfo:
     """
     두 영양정보를 병합 (primary 우선, None인 경우 secondary로 보완)
     """
-    return NutritionInfo(
-        calories_value=primary.calories_value or secondary.calories_value,
-        calories_unit=primary.calories_unit or secondary.calories_unit,
-        carbs_value=primary.carbs_value or secondary.carbs_value,
-        carbs_unit=primary.carbs_unit or secondary.carbs_unit,
-        sugar_value=primary.sugar_value or secondary.sugar_value,
-        sugar_unit=primary.sugar_unit or secondary.sugar_unit,
-        protein_value=primary.protein_value or secondary.protein_value,
-        protein_unit=primary.protein_unit or secondary.protein_unit,
-        fat_value=primary.fat_value or secondary.fat_value,
-        fat_unit=primary.fat_unit or secondary.fat_unit,
-        saturated_fat_value=primary.saturated_fat_value or secondary.saturated_fat_value,
-        saturated_fat_unit=primary.saturated_fat_unit or secondary.saturated_fat_unit,
-        trans_fat_value=primary.trans_fat_value or secondary.trans_fat_value,
-        trans_fat_unit=primary.trans_fat_unit or secondary.trans_fat_unit,
-        cholesterol_value=primary.cholesterol_value or secondary.cholesterol_value,
-        cholesterol_unit=primary.cholesterol_unit or secondary.cholesterol_unit,
-        sodium_value=primary.sodium_value or secondary.sodium_value,
-        sodium_unit=primary.sodium_unit or secondary.sodium_unit,
-        serving_size=primary.serving_size or secondary.serving_size,
-        allergens=primary.allergens or secondary.allergens,
-    )
+    return NutritionInfo(*[
+        a or b for a, b in zip(_NUTRITION_GETTER(primary), _NUTRITION_GETTER(secondary))
+    ])
 
 
 def nutrition_to_dict(info: NutritionInfo) -> Dict[str, Any]:
-    return asdict(info)
+    return dict(zip(_NUTRITION_FIELDS, _NUTRITION_GETTER(info)))
 
 
 # ===================== 저장소 =====================
 
-ocr_results: List[Dict[str, Any]] = []
+# 분석 결과는 SQLite 에 저장 (메모리 사용량이 업로드 수에 비례해 늘지 않고, 재시작해도 유지)
+# static 아래에 두면 DB 파일이 그대로 공개되므로 서버 폴더에 둠
+RESULTS_DB = Path(os.environ.get("RESULTS_DB", str(BASE_DIR / "results.db")))
+_RESULT_COLUMNS = ("id", "label", "filename", "text", "analysis", "translated_text", "created_at")
+
+# 요청마다 스레드를 쓰므로 연결 하나를 잠금으로 보호해 공유
+_DB_LOCK = threading.Lock()
+_DB = sqlite3.connect(str(RESULTS_DB), check_same_thread=False, isolation_level=None)
+_DB.execute(
+    "CREATE TABLE IF NOT EXISTS results ("
+    "id TEXT PRIMARY KEY, label TEXT, filename TEXT, text TEXT,"
+    " analysis TEXT, translated_text TEXT, created_at TEXT, digest TEXT)"
+)
+# digest 열이 없던 이전 DB 파일 보강
+if "digest" not in {row[1] for row in _DB.execute("PRAGMA table_info(results)")}:
+    _DB.execute("ALTER TABLE results ADD COLUMN digest TEXT")
+# 업로드 내용 해시 → 결과 (중복 업로드 시 OCR 생략, 재시작 후에도 유지)
+_DB.execute("CREATE INDEX IF NOT EXISTS results_digest ON results (digest)")
 
 
-# ===================== Routes =====================
+def _row_to_result(row: tuple) -> Dict[str, Any]:
+    result = dict(zip(_RESULT_COLUMNS, row))
+    result["analysis"] = orjson.loads(result["analysis"])
+    return result
 
-@app.route("/")
-def index():
-    return render_template("index.html", results=ocr_results)
 
+def save_result(result: Dict[str, Any], digest: str) -> None:
+    values = [result[col] for col in _RESULT_COLUMNS]
+    values[4] = orjson.dumps(result["analysis"]).decode()
+    values.append(digest)
+    with _DB_LOCK:
+        _DB.execute(
+            f"INSERT INTO results ({', '.join(_RESULT_COLUMNS)}, digest)"
+            f" VALUES ({', '.join('?' * (len(_RESULT_COLUMNS) + 1))})",
+            values,
+        )
 
-@app.route("/detail/<item_id>")
-def detail(item_id):
-    item = next((x for x in ocr_results if x["id"] == item_id), None)
-    if not item:
-        return "Not Found", 404
-    return render_template("detail.html", item=item)
 
+def get_result(item_id: str) -> Optional[Dict[str, Any]]:
+    """id 로 결과 하나 조회 (기본 키 인덱스)"""
+    with _DB_LOCK:
+        row = _DB.execute(
+            f"SELECT {', '.join(_RESULT_COLUMNS)} FROM results WHERE id = ?", (item_id,)
+        ).fetchone()
+    return _row_to_result(row) if row else None
 
-@app.route("/upload", methods=["POST"])
-@app.route("/api/upload", methods=["POST"])
-def api_upload():
-    if "file" not in request.files:
-        if request.path == "/api/upload" or request.headers.get("Accept") == "application/json":
-            return Response(json.dumps({"error": "No file provided"}, ensure_ascii=False),
-                            content_type="application/json; charset=utf-8")
-        return redirect(url_for("index"))
 
-    file = request.files["file"]
-    label = request.form.get("label", "").strip() or None  # 제품명 (선택)
-    
-    item_id = str(uuid.uuid4())
-    filename = f"{item_id}.jpg"
-    save_path = UPLOAD_DIR / filename
-    file.save(save_path)
+# 목록 화면에 필요한 열만 (OCR 텍스트는 미리보기 120자 + 말줄임 판단용 1자, 번역문 제외)
+_LIST_COLUMNS = ("id", "label", "filename", "text", "analysis", "created_at")
+_LIST_SELECT = "SELECT id, label, filename, substr(text, 1, 121), analysis, created_at FROM results"
+
+
+def find_result_by_digest(digest: str) -> Optional[Dict[str, Any]]:
+    """같은 내용으로 처음 분석한 결과 (digest 인덱스)"""
+    with _DB_LOCK:
+        row = _DB.execute(
+            f"SELECT {', '.join(_RESULT_COLUMNS)} FROM results WHERE digest = ? ORDER BY rowid LIMIT 1", (digest,)
+        ).fetchone()
+    return _row_to_result(row) if row else None
+
+
+def list_results(limit: int, offset: int = 0) -> List[Dict[str, Any]]:
+    """최근 업로드부터 한 페이지 분량의 결과"""
+    with _DB_LOCK:
+        rows = _DB.execute(f"{_LIST_SELECT} ORDER BY rowid DESC LIMIT ? OFFSET ?", (limit, offset)).fetchall()
+    results = []
+    for row in rows:
+        result = dict(zip(_LIST_COLUMNS, row))
+        result["analysis"] = orjson.loads(result["analysis"])
+        results.append(result)
+    return results
+
 
+def count_results() -> int:
+    with _DB_LOCK:
+        return _DB.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+# 비동기 업로드(202 응답)의 분석 작업 - OCR 은 tesseract 서브프로세스라 스레드로 충분
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", os.cpu_count() or 1))
+ANALYSIS_EXECUTOR = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS)
+# id → 진행 중인 분석 작업 (끝나면 제거 - 성공하면 결과가 DB 에, 실패하면 failed_uploads 에 남음)
+pending_uploads: Dict[str, Any] = {}
+# id → 실패한 분석의 오류 메시지 (상태 조회용, 오래된 것부터 버림)
+FAILED_UPLOADS_MAX = 256
+failed_uploads: "OrderedDict[str, str]" = OrderedDict()
+# 내용 해시 → 진행 중인 분석 (같은 이미지가 동시에 올라오면 한 번만 OCR 하고 나머지는 결과를 기다림)
+_ANALYSIS_LOCK = threading.Lock()
+analyses_in_flight: Dict[str, Future] = {}
+
+
+# 업로드 이미지 최대 변 길이 - 이보다 큰 사진(휴대폰 원본 등)은 줄여서 저장
+# (라즈베리파이 캡처 1920x1080 은 그대로 유지, OCR 단계의 확대 폭 2000~3000px 과 비슷한 수준)
+MAX_UPLOAD_SIDE = int(os.environ.get("MAX_UPLOAD_SIDE", "2000"))
+UPLOAD_JPEG_QUALITY = 85
+# 업로드 파일 저장용 쓰기 버퍼 크기
+UPLOAD_WRITE_BUFFER = 1 << 20
+
+
+# (초, 포맷된 문자열) - 같은 초 안의 업로드는 strftime 없이 재사용
+_CREATED_AT_CACHE = (0, "")
+
+
+def utc_timestamp_str() -> str:
+    """현재 UTC 시각 문자열 "%Y-%m-%d %H:%M:%S" (초 단위로 캐시)"""
+    global _CREATED_AT_CACHE
+    now = int(time.time())
+    cached_sec, cached_str = _CREATED_AT_CACHE
+    if now != cached_sec:
+        cached_str = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        _CREATED_AT_CACHE = (now, cached_str)
+    return cached_str
+
+
+def shrink_upload(save_path: Path) -> None:
+    """큰 업로드 이미지를 MAX_UPLOAD_SIDE 이하로 줄여 같은 형식으로 다시 저장 (작은 이미지는 그대로 둠)"""
+    try:
+        with Image.open(save_path) as img:
+            if max(img.size) <= MAX_UPLOAD_SIDE:
+                return
+            # JPEG 는 디코딩 단계에서 바로 축소 (DCT 스케일링)
+            img.draft("RGB", (MAX_UPLOAD_SIDE, MAX_UPLOAD_SIDE))
+            # cv2.imread 와 같은 방향이 되도록 EXIF 회전을 먼저 적용
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((MAX_UPLOAD_SIDE, MAX_UPLOAD_SIDE), Image.LANCZOS)
+            img = img.convert("RGB")
+    except (UnidentifiedImageError, OSError) as e:
+        logger.warning("[업로드 축소 오류] %s", e)
+        return
+
+    if save_path.suffix == ".jpg":
+        img.save(save_path, "JPEG", quality=UPLOAD_JPEG_QUALITY, optimize=True)
+    else:
+        img.save(save_path)  # 확장자로 형식 결정
+    logger.info("[업로드 축소] %sx%s", img.size[0], img.size[1])
+
+
+# 파일 시그니처 (매직 바이트) → 저장 확장자
+_UPLOAD_MAGIC = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF8", ".gif"),
+    (b"BM", ".bmp"),
+    (b"II*\x00", ".tif"),
+    (b"MM\x00*", ".tif"),
+)
+
+
+def upload_extension(stream) -> str:
+    """업로드 내용의 앞 16바이트로 실제 이미지 형식 판별 (모르는 형식은 기존처럼 .jpg)"""
+    head = stream.read(16)
+    stream.seek(0)
+    for magic, ext in _UPLOAD_MAGIC:
+        if head.startswith(magic):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[4:8] == b"ftyp" and head[8:12] in (b"heic", b"heix", b"mif1", b"msf1"):
+        return ".heic"
+    return ".jpg"
+
+
+def upload_digest(stream) -> str:
+    """업로드 내용 해시 (BLAKE2b 128bit) - 중복 업로드 판별 및 파일 이름에 사용"""
+    h = hashlib.blake2b(digest_size=16)
+    while chunk := stream.read(1 << 20):
+        h.update(chunk)
+    stream.seek(0)
+    return h.hexdigest()
+
+
+def _copy_upload(stream, fd: int) -> None:
+    """
+    업로드 스트림을 fd 로 복사하고 fd 를 닫음
+    - 디스크 임시 파일로 받은 경우 os.sendfile 로 커널 안에서 복사 (사용자 공간 버퍼 복사 없음)
+    - 메모리에 있는 작은 파일은 1MB 버퍼로 한 번에 씀
+    """
+    # werkzeug 는 SpooledTemporaryFile 을 쓰며, 500KB 를 넘으면 실제 파일로 넘어감(_rolled)
+    # (메모리 상태에서 fileno() 를 부르면 오히려 디스크로 옮겨지므로 먼저 확인)
+    if not hasattr(os, "sendfile") or not getattr(stream, "_rolled", False):
+        with os.fdopen(fd, "wb", buffering=UPLOAD_WRITE_BUFFER) as out:
+            shutil.copyfileobj(stream, out, UPLOAD_WRITE_BUFFER)
+        return
+
+    try:
+        stream.flush()
+        src_fd = stream.fileno()
+        size = os.fstat(src_fd).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(fd, src_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    finally:
+        os.close(fd)
+
+
+def _discard_upload(tmp_path: Path) -> None:
+    try:
+        os.unlink(tmp_path)
+    except OSError:
+        pass
+
+
+def save_upload(file, save_path: Path) -> Optional[Path]:
+    """
+    업로드 파일을 UPLOAD_DIR 안의 임시 파일에 저장 (save_path 자리에는 publish_upload 가 바꿔 넣음)
+    Returns: 임시 파일 경로, 같은 내용의 파일이 이미 있으면 쓰지 않고 None
+    """
+    if save_path.exists():
+        return None
+    fd, tmp_name = tempfile.mkstemp(dir=UPLOAD_DIR, prefix=".upload-", suffix=save_path.suffix)
+    try:
+        _copy_upload(file.stream, fd)
+        os.chmod(tmp_name, 0o644)  # mkstemp 는 0600 으로 만듦 (정적 파일로 제공)
+    except BaseException:
+        _discard_upload(Path(tmp_name))
+        raise
+    return Path(tmp_name)
+
+
+def publish_upload(tmp_path: Path, save_path: Path) -> None:
+    """
+    임시 파일을 축소한 뒤 os.replace 로 save_path 에 한 번에 바꿔 넣음
+    (내용 해시 이름의 파일은 나타난 뒤 다시 쓰지 않으므로 다른 요청이 쓰다 만 파일을 읽지 않음)
+    """
+    try:
+        shrink_upload(tmp_path)
+        os.replace(tmp_path, save_path)
+    except BaseException:
+        _discard_upload(tmp_path)
+        raise
+
+
+# 이보다 긴 OCR 텍스트가 담긴 결과는 JSON 을 필드 단위로 나눠 스트리밍 (전체 문자열을 한 번에 만들지 않음)
+STREAM_JSON_MIN_CHARS = 64 * 1024
+
+
+def iter_json_object(obj: Dict[str, Any]):
+    """dict 를 최상위 필드 단위 JSON 조각(bytes)으로 생성"""
+    yield b"{"
+    for i, (key, value) in enumerate(obj.items()):
+        if i:
+            yield b","
+        yield orjson.dumps(key)
+        yield b":"
+        yield orjson.dumps(value)
+    yield b"}"
+
+
+def result_json_response(result: Dict[str, Any]) -> Response:
+    """결과 JSON 응답 - 긴 텍스트는 스트리밍으로 전송"""
+    if len(result.get("text") or "") + len(result.get("translated_text") or "") >= STREAM_JSON_MIN_CHARS:
+        return Response(iter_json_object(result), content_type="application/json; charset=utf-8")
+    return Response(orjson.dumps(result), content_type="application/json; charset=utf-8")
+
+
+# 업로드 이미지 OCR 언어 (예열도 같은 언어 데이터로 해야 첫 업로드가 빨라짐)
+OCR_LANG = "kor+eng"
+
+
+def analyze_image(save_path: Path) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    이미지 OCR → (필요 시) 번역 → 영양·알레르기 분석
+    Returns: (OCR 텍스트, 번역 텍스트, 분석 결과 dict)
+    """
     # OCR
-    text = run_ocr(str(save_path), lang="kor+eng")
+    text = run_ocr(str(save_path), lang=OCR_LANG)
 
     # 디버그: OCR 결과 출력
-    print(f"[OCR 원본 - 전체]\n{text}\n{'='*50}")
+    logger.debug("[OCR 원본 - 전체]\n%s\n%s", text, "=" * 50)
 
     # 영어 텍스트인 경우 한국어로 번역
     translated = ""
@@ -1313,14 +1807,22 @@ def api_upload():
     
     if ENABLE_TRANSLATION and PAPAGO_CLIENT_ID and PAPAGO_CLIENT_SECRET:
         # 영어가 주로 포함된 경우 번역
-        korean_chars = len(re.findall(r'[가-힣]', text))
-        english_chars = len(re.findall(r'[a-zA-Z]', text))
+        english_chars = len(_RE_NON_LATIN.sub("", text))
+        # 영문자가 너무 적으면 한글은 셀 필요도 없음, ASCII 텍스트는 한글 0자
+        if english_chars < TRANSLATE_MIN_LATIN_CHARS or text.isascii():
+            korean_chars = 0
+        else:
+            korean_chars = len(_RE_NON_HANGUL.sub("", text))
         
-        if english_chars > korean_chars:
-            print("[번역] 영어 텍스트 감지 → 한국어로 번역 중...")
-            translated = translate_text_papago(text)
+        if english_chars > korean_chars and english_chars >= TRANSLATE_MIN_LATIN_CHARS:
+            logger.info("[번역] 영어 텍스트 감지 → 한국어로 번역 중...")
+            # 번역 응답을 기다리는 동안 영어 원본 분석을 먼저 수행
+            translate_future = TRANSLATE_EXECUTOR.submit(translate_text_papago, text)
+            nutrition_original = extract_nutrition_and_allergens_english(text)
+            translated = translate_future.result()
             if translated:
-                print(f"[번역 결과]\n{translated[:500]}...")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[번역 결과]\n%s...", translated[:500])
                 analysis_text = translated
     
     # 분석 (번역된 텍스트 또는 원본 사용)
@@ -1328,46 +1830,234 @@ def api_upload():
     
     # 영어 원본에서도 추가 분석 (번역이 부정확할 경우 대비)
     if translated:
-        nutrition_original = extract_nutrition_and_allergens_english(text)
         # 번역 분석에서 못 찾은 값은 영어 분석으로 보완
         nutrition = merge_nutrition(nutrition, nutrition_original)
     
     # 디버그: 영양 정보 출력 (상세)
-    print(f"[영양 분석]")
-    print(f"  열량: {nutrition.calories_value} {nutrition.calories_unit or ''}")
-    print(f"  탄수화물: {nutrition.carbs_value} {nutrition.carbs_unit or ''}")
-    print(f"  당류: {nutrition.sugar_value} {nutrition.sugar_unit or ''}")
-    print(f"  단백질: {nutrition.protein_value} {nutrition.protein_unit or ''}")
-    print(f"  지방: {nutrition.fat_value} {nutrition.fat_unit or ''}")
-    print(f"  나트륨: {nutrition.sodium_value} {nutrition.sodium_unit or ''}")
-    print(f"  알레르기: {nutrition.allergens}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "[영양 분석]\n  열량: %s %s\n  탄수화물: %s %s\n  당류: %s %s\n  단백질: %s %s\n"
+            "  지방: %s %s\n  나트륨: %s %s\n  알레르기: %s",
+            nutrition.calories_value, nutrition.calories_unit or '',
+            nutrition.carbs_value, nutrition.carbs_unit or '',
+            nutrition.sugar_value, nutrition.sugar_unit or '',
+            nutrition.protein_value, nutrition.protein_unit or '',
+            nutrition.fat_value, nutrition.fat_unit or '',
+            nutrition.sodium_value, nutrition.sodium_unit or '',
+            nutrition.allergens,
+        )
 
+    return text, translated, nutrition_to_dict(nutrition)
+
+
+def store_result(item_id: str, label: Optional[str], filename: str, text: str, translated: str,
+                 analysis: Dict[str, Any], digest: str, detail_url: str) -> Dict[str, Any]:
     result = {
         "id": item_id,
         "label": label,
         "filename": filename,
         "text": text,
-        "analysis": nutrition_to_dict(nutrition),
+        "analysis": analysis,
         "translated_text": translated,
-        "created_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-        "detail_url": url_for("detail", item_id=item_id, _external=True)
+        "created_at": utc_timestamp_str(),
+        "detail_url": detail_url,
     }
+    save_result(result, digest)
+    return result
 
-    ocr_results.append(result)
+
+def copy_result(item_id: str, label: Optional[str], filename: str, digest: str, detail_url: str,
+                source: Dict[str, Any]) -> Dict[str, Any]:
+    """같은 이미지의 다른 업로드 결과(source)를 이 업로드의 결과로 저장 (OCR 생략)"""
+    return store_result(item_id, label, filename, source["text"], source["translated_text"],
+                        source["analysis"], digest, detail_url)
+
+
+def claim_analysis(digest: str) -> Tuple[Optional[Dict[str, Any]], Optional[Future], bool]:
+    """
+    같은 내용의 이전 결과나 진행 중인 분석 확인, 둘 다 없으면 분석을 새로 맡음
+    Returns: (이전 결과, 분석 작업, 새로 맡았는지) - 이전 결과가 있으면 분석 작업은 None
+    """
+    with _ANALYSIS_LOCK:
+        analysis = analyses_in_flight.get(digest)
+        if analysis is not None:
+            return None, analysis, False
+        # 분석은 결과를 DB 에 저장한 뒤 목록에서 빠지므로, 목록에 없으면 DB 에 있거나 아직 분석 전
+        previous = find_result_by_digest(digest)
+        if previous:
+            return previous, None, False
+        analysis = Future()
+        analyses_in_flight[digest] = analysis
+        return None, analysis, True
+
+
+def release_analysis(digest: str, analysis: Future, result: Optional[Dict[str, Any]] = None,
+                     error: Optional[BaseException] = None) -> None:
+    """맡은 분석을 목록에서 빼고 기다리던 요청들에 결과(또는 오류) 전달"""
+    with _ANALYSIS_LOCK:
+        analyses_in_flight.pop(digest, None)
+    if error is not None:
+        analysis.set_exception(error)
+    else:
+        analysis.set_result(result)
+
+
+def analyze_upload(item_id: str, label: Optional[str], filename: str, save_path: Path,
+                   digest: str, detail_url: str, analysis: Future,
+                   tmp_path: Optional[Path]) -> Dict[str, Any]:
+    """저장된 업로드 이미지 분석 후 결과 저장 (요청 스레드 또는 ANALYSIS_EXECUTOR 에서 실행)"""
+    try:
+        if tmp_path is not None:
+            publish_upload(tmp_path, save_path)
+        text, translated, nutrition = analyze_image(save_path)
+        result = store_result(item_id, label, filename, text, translated, nutrition, digest, detail_url)
+    except BaseException as e:
+        release_analysis(digest, analysis, error=e)
+        raise
+    release_analysis(digest, analysis, result)
+    return result
+
+
+def follow_analysis(analysis: Future, item_id: str, label: Optional[str], filename: str,
+                    digest: str, detail_url: str) -> Future:
+    """진행 중인 같은 이미지 분석이 끝나면 그 결과를 이 업로드의 결과로 저장하는 작업"""
+    future: Future = Future()
+
+    def done(finished: Future) -> None:
+        try:
+            future.set_result(copy_result(item_id, label, filename, digest, detail_url, finished.result()))
+        except Exception as e:
+            future.set_exception(e)
+
+    analysis.add_done_callback(done)
+    return future
+
+
+def finish_upload(item_id: str, future) -> None:
+    """비동기 분석 완료 콜백 - 목록에서 제거, 실패는 오류 메시지만 상태 조회용으로 남김 (이미지·트레이스백은 놓음)"""
+    error = future.exception()
+    if error is not None:
+        logger.error("[분석 실패] %s: %s", item_id, error)
+        failed_uploads[item_id] = str(error)
+        while len(failed_uploads) > FAILED_UPLOADS_MAX:
+            failed_uploads.popitem(last=False)
+    pending_uploads.pop(item_id, None)
+
+
+def accept_async(item_id: str, future: Future) -> Response:
+    """비동기 업로드 응답 - 작업을 상태 조회 목록에 올리고 202 + 상태 조회 URL 반환"""
+    pending_uploads[item_id] = future
+    future.add_done_callback(lambda f: finish_upload(item_id, f))
+    body = {"id": item_id, "status": "processing",
+            "status_url": url_for("status", item_id=item_id, _external=True)}
+    return Response(orjson.dumps(body), status=202, content_type="application/json; charset=utf-8")
+
+
+# ===================== Routes =====================
+
+# 메인 화면 한 페이지에 보여줄 결과 수
+INDEX_PAGE_SIZE = 50
+
+
+@app.route("/")
+def index():
+    page = max(request.args.get("p", 0, type=int), 0)
+    total = count_results()
+    results = list_results(INDEX_PAGE_SIZE, page * INDEX_PAGE_SIZE)
+    # 응답 본문을 한 번에 만들지 않고 렌더링되는 대로 전송
+    return stream_template(
+        "index.html", results=results, total=total, page=page,
+        has_next=(page + 1) * INDEX_PAGE_SIZE < total,
+    )
+
+
+@app.route("/detail/<item_id>")
+def detail(item_id):
+    item = get_result(item_id)
+    if not item:
+        return "Not Found", 404
+    return render_template("detail.html", item=item)
+
+
+@app.route("/status/<item_id>")
+def status(item_id):
+    """비동기 업로드 상태 - 처리 중이면 202, 끝나면 결과 JSON"""
+    future = pending_uploads.get(item_id)
+    # 완료 콜백이 아직 안 돌았으면 작업에서, 이미 돌았으면 failed_uploads 에서 오류를 꺼냄
+    error = failed_uploads.get(item_id)
+    if future is not None:
+        if not future.done():
+            body = {"id": item_id, "status": "processing"}
+            return Response(orjson.dumps(body), status=202, content_type="application/json; charset=utf-8")
+        if future.exception() is not None:
+            error = str(future.exception())
+    if error is not None:
+        body = {"id": item_id, "status": "failed", "error": error}
+        return Response(orjson.dumps(body), status=500, content_type="application/json; charset=utf-8")
+    result = get_result(item_id)
+    if not result:
+        return Response(orjson.dumps({"error": "Not Found"}), status=404,
+                        content_type="application/json; charset=utf-8")
+    result["detail_url"] = url_for("detail", item_id=item_id, _external=True)
+    return result_json_response(result)
+
+
+@app.route("/health")
+def health():
+    """연결 확인용 가벼운 응답 (클라이언트 keep-alive 예열, 헬스 체크)"""
+    return Response(b'{"status":"ok"}', content_type="application/json; charset=utf-8")
+
+
+@app.route("/upload", methods=["POST"])
+@app.route("/api/upload", methods=["POST"])
+def api_upload():
+    if "file" not in request.files:
+        if request.path == "/api/upload" or request.headers.get("Accept") == "application/json":
+            return Response(orjson.dumps({"error": "No file provided"}),
+                            content_type="application/json; charset=utf-8")
+        return redirect(url_for("index"))
+
+    file = request.files["file"]
+    label = request.form.get("label", "").strip() or None  # 제품명 (선택)
+    
+    item_id = str(uuid.uuid4())
+    detail_url = url_for("detail", item_id=item_id, _external=True)
+    # 같은 이미지(내용 해시)는 파일 하나로 저장하고 OCR·분석 결과를 재사용
+    digest = upload_digest(file.stream)
+    # 받은 바이트를 다시 인코딩하지 않고 그대로 저장하므로 확장자를 실제 형식에 맞춤
+    filename = digest + upload_extension(file.stream)
+    save_path = UPLOAD_DIR / filename
+    # ?async=1 또는 Prefer: respond-async 이면 분석을 맡기고 바로 202 + 상태 조회 URL 반환
+    run_async = request.args.get("async") == "1" or "respond-async" in request.headers.get("Prefer", "")
+    previous, analysis, leader = claim_analysis(digest)
+    if previous:
+        logger.info("[중복 업로드] %s → 이전 OCR 결과 재사용", digest)
+        result = copy_result(item_id, label, filename, digest, detail_url, previous)
+    elif not leader:
+        # 같은 이미지를 분석 중인 요청이 있으면 파일을 다시 쓰지 않고 그 결과를 기다림
+        logger.info("[중복 업로드] %s → 진행 중인 분석 결과 대기", digest)
+        if run_async:
+            return accept_async(item_id, follow_analysis(analysis, item_id, label, filename, digest, detail_url))
+        result = copy_result(item_id, label, filename, digest, detail_url, analysis.result())
+    else:
+        try:
+            tmp_path = save_upload(file, save_path)
+        except BaseException as e:
+            release_analysis(digest, analysis, error=e)
+            raise
+        if run_async:
+            return accept_async(item_id, ANALYSIS_EXECUTOR.submit(
+                analyze_upload, item_id, label, filename, save_path, digest, detail_url, analysis, tmp_path
+            ))
+        result = analyze_upload(item_id, label, filename, save_path, digest, detail_url, analysis, tmp_path)
 
     # 웹 폼에서 업로드한 경우 리다이렉트, API 요청이면 JSON 반환
     if request.path == "/api/upload" and request.headers.get("X-Requested-With") == "XMLHttpRequest":
-        return Response(
-            json.dumps(result, ensure_ascii=False),
-            content_type="application/json; charset=utf-8"
-        )
+        return result_json_response(result)
     
     # 라즈베리파이 등 외부에서 API로 요청한 경우 JSON 반환
     if request.headers.get("Accept") == "application/json" or "python-requests" in request.headers.get("User-Agent", "").lower():
-        return Response(
-            json.dumps(result, ensure_ascii=False),
-            content_type="application/json; charset=utf-8"
-        )
+        return result_json_response(result)
     
     # 웹 폼에서 업로드한 경우 메인 페이지로 리다이렉트
     return redirect(url_for("index"))
@@ -1376,4 +2066,7 @@ def api_upload():
 # ===================== 실행 =====================
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # 첫 업로드가 Tesseract 콜드 스타트를 떠안지 않도록 백그라운드에서 미리 실행
+    threading.Thread(target=warm_up, args=(OCR_LANG,), daemon=True).start()
+    # OCR(CPU)·Papago(네트워크) 대기 중에도 다른 요청을 처리하도록 요청마다 스레드 사용
+    app.run(host="0.0.0.0", port=5000, debug=True, threaded=True)
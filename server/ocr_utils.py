@@ -1,10 +1,41 @@
+import logging
+import os
+import platform
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Optional, Union
+
+# tesseract 의 OpenMP 멀티스레딩은 프로세스 여러 개를 동시에 돌릴 때 오히려 느려지므로
+# 프로세스당 1스레드로 제한 (자식 tesseract 프로세스가 이 환경변수를 물려받음)
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+# 언어 데이터(traineddata) 폴더 - 지정하면 시스템 기본 대신 사용
+# tessdata_fast (정수 양자화 LSTM 모델) 를 받아 지정하면 인식 속도가 크게 빨라짐
+# (명령줄 --tessdata-dir 은 경로 따옴표 처리가 OS 마다 달라, 자식 프로세스가 물려받는 TESSDATA_PREFIX 로 넘김)
+TESSDATA_DIR = os.environ.get("TESSDATA_DIR")
+if TESSDATA_DIR:
+    os.environ["TESSDATA_PREFIX"] = TESSDATA_DIR
 
 import cv2
 import numpy as np
 import pytesseract
 from pytesseract import Output
 
+# Tesseract 실행 경로
+# Windows: C:\Program Files\Tesseract-OCR\tesseract.exe
+# Linux: /usr/bin/tesseract (기본 PATH에 있음)
+if platform.system() == "Windows":
+    TESSERACT_CMD = os.environ.get("TESSERACT_CMD", r"C:\Program Files\Tesseract-OCR\tesseract.exe")
+else:
+    TESSERACT_CMD = os.environ.get("TESSERACT_CMD", "tesseract")
+
+pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
 # 한글만 인식 (영어 오인식 방지)
 TESSERACT_LANG = "kor"
 # PSM 모드: 3=자동, 4=단일열, 6=단일블록, 11=희소텍스트
@@ -14,6 +45,47 @@ TESSERACT_CONFIG_SPARSE = "--oem 3 --psm 11"
 TESSERACT_CONFIG_AUTO = "--oem 3 --psm 3"
 TESSERACT_CONFIG_SINGLE_COL = "--oem 3 --psm 4"  # 단일 열 (표 형식에 좋음)
 
+# OCR 모드: "thorough" = 모든 변형 × 설정 실행 (기본)
+#           "fast" = 기본 전처리 + PSM 6 한 번의 평균 신뢰도가 OCR_FAST_MIN_CONF 이상이면 그 결과만 사용
+OCR_MODE = os.environ.get("OCR_MODE", "thorough").lower()
+OCR_FAST_MIN_CONF = float(os.environ.get("OCR_FAST_MIN_CONF", "75"))
+
+# 전처리 노이즈 제거를 bilateral filter 대신 3x3 미디언 필터로 (훨씬 빠르지만 결과 이미지가 달라짐)
+OCR_FAST_DENOISE = os.environ.get("OCR_FAST_DENOISE", "false").lower() == "true"
+
+# 전처리 이미지들을 이미지 목록 파일로 묶어 설정별로 tesseract 를 한 번만 실행
+# (프로세스 기동 + 언어 데이터 로딩 비용을 이미지 수만큼 반복하지 않음)
+TESSERACT_BATCH = os.environ.get("TESSERACT_BATCH", "true").lower() == "true"
+# tesseract 가 페이지(이미지) 사이에 넣는 구분자
+PAGE_SEPARATOR = "\f"
+
+# 동시에 실행할 tesseract 프로세스 수 (기본: CPU 코어 수)
+# 실제 작업은 자식 프로세스가 하므로 스레드 풀로 충분하며, 여러 업로드가 이 풀을 함께 씀
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", os.cpu_count() or 1))
+_OCR_POOL = ThreadPoolExecutor(max_workers=OCR_WORKERS)
+
+# OpenCV 내부 스레드 수 - 동시 업로드마다 전처리가 모든 코어로 퍼지면 tesseract 프로세스와 경합하므로 제한
+OPENCV_THREADS = int(os.environ.get("OPENCV_THREADS", "2"))
+cv2.setNumThreads(OPENCV_THREADS)
+
+# run_ocr 전처리 변형을 동시에 만드는 스레드 수 (OpenCV 는 연산 중 GIL 을 놓음, 여러 업로드가 이 풀을 함께 씀)
+PREPROCESS_WORKERS = int(os.environ.get("PREPROCESS_WORKERS", min(8, os.cpu_count() or 1)))
+_PREPROCESS_POOL = ThreadPoolExecutor(max_workers=PREPROCESS_WORKERS)
+
+# 동시에 들어온 업로드들의 전처리 이미지를 한 목록 파일로 합쳐 설정별 tesseract 실행을 함께 함
+# (실행 중인 배치가 있으면 첫 요청 뒤 OCR_BATCH_WINDOW_MS 동안 또는 OCR_BATCH_MAX 건까지 모음,
+#  실행 중인 배치도 다른 대기 요청도 없으면 바로 실행)
+OCR_BATCH_WINDOW_MS = int(os.environ.get("OCR_BATCH_WINDOW_MS", "50"))
+OCR_BATCH_MAX = int(os.environ.get("OCR_BATCH_MAX", "16"))
+_BATCH_QUEUE: "queue.Queue" = queue.Queue()
+# 모은 배치를 실행하는 스레드 (배치 실행이 _OCR_POOL 을 기다리므로 _OCR_POOL 과 따로 둠)
+# 배치를 맡기면 수집 스레드는 바로 다음 요청을 모음
+_BATCH_RUN_POOL = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix="ocr-batch-run")
+_BATCH_THREAD_LOCK = threading.Lock()
+_batch_thread: Optional[threading.Thread] = None
+
+logger = logging.getLogger(__name__)
+
 
 def resize_image(img: np.ndarray, target_width: int = 1800) -> np.ndarray:
     """이미지 리사이즈 - OCR 성능 향상"""
@@ -51,20 +123,35 @@ def adjust_brightness_contrast(img: np.ndarray, brightness: int = 30, contrast:
     return img
 
 
+def _read_image(image: Union[str, np.ndarray]) -> np.ndarray:
+    """경로면 이미지를 읽고, 이미 디코딩된 배열이면 그대로 사용"""
+    if isinstance(image, np.ndarray):
+        return image
+    img = cv2.imread(image)
+    if img is None:
+        raise FileNotFoundError(f"이미지를 찾을 수 없음: {image}")
+    return img
+
+
+@lru_cache(maxsize=32)
+def _gamma_table(gamma: float) -> np.ndarray:
+    """감마 보정용 256 칸 LUT (감마 값별로 한 번만 계산)"""
+    inv_gamma = 1.0 / gamma
+    table = ((np.arange(256) / 255.0) ** inv_gamma * 255).astype("uint8")
+    table.setflags(write=False)  # 캐시된 배열이 바뀌지 않도록
+    return table
+
+
 def gamma_correction(img: np.ndarray, gamma: float = 1.2) -> np.ndarray:
     """감마 보정 - 어두운 이미지 밝게"""
-    inv_gamma = 1.0 / gamma
-    table = np.array([((i / 255.0) ** inv_gamma) * 255 for i in np.arange(0, 256)]).astype("uint8")
-    return cv2.LUT(img, table)
+    return cv2.LUT(img, _gamma_table(gamma))
 
 
-def preprocess_image(image_path: str) -> np.ndarray:
+def preprocess_image(image: Union[str, np.ndarray]) -> np.ndarray:
     """
     식품 라벨 OCR을 위한 이미지 전처리 (강화됨)
     """
-    img = cv2.imread(image_path)
-    if img is None:
-        raise FileNotFoundError(f"이미지를 찾을 수 없음: {image_path}")
+    img = _read_image(image)
     
     # 리사이즈
     img = resize_image(img)
@@ -78,8 +165,11 @@ def preprocess_image(image_path: str) -> np.ndarray:
     # 감마 보정 (어두운 이미지 밝게)
     gray = gamma_correction(gray, gamma=1.3)
     
-    # 노이즈 제거 (bilateral filter - 엣지 보존)
-    denoised = cv2.bilateralFilter(gray, 9, 75, 75)
+    # 노이즈 제거 (bilateral filter - 엣지 보존, 빠른 모드는 3x3 미디언)
+    if OCR_FAST_DENOISE:
+        denoised = cv2.medianBlur(gray, 3)
+    else:
+        denoised = cv2.bilateralFilter(gray, 9, 75, 75)
     
     # CLAHE - 대비 향상 (더 강하게)
     clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
@@ -94,13 +184,11 @@ def preprocess_image(image_path: str) -> np.ndarray:
     return sharpened
 
 
-def preprocess_for_table(image_path: str) -> np.ndarray:
+def preprocess_for_table(image: Union[str, np.ndarray]) -> np.ndarray:
     """
     표 형식 영양성분표를 위한 특수 전처리
     """
-    img = cv2.imread(image_path)
-    if img is None:
-        raise FileNotFoundError(f"이미지를 찾을 수 없음: {image_path}")
+    img = _read_image(image)
     
     # 리사이즈
     img = resize_image(img, target_width=1500)
@@ -115,20 +203,14 @@ def preprocess_for_table(image_path: str) -> np.ndarray:
     # Otsu 이진화 (표 텍스트에 효과적)
     _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
     
-    # 모폴로지 연산으로 텍스트 강화
-    kernel = np.ones((1, 1), np.uint8)
-    binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
-    
     return binary
 
 
-def preprocess_invert(image_path: str) -> np.ndarray:
+def preprocess_invert(image: Union[str, np.ndarray]) -> np.ndarray:
     """
     반전 이미지 전처리 (어두운 배경의 텍스트용)
     """
-    img = cv2.imread(image_path)
-    if img is None:
-        raise FileNotFoundError(f"이미지를 찾을 수 없음: {image_path}")
+    img = _read_image(image)
     
     img = resize_image(img)
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
@@ -143,6 +225,63 @@ def preprocess_invert(image_path: str) -> np.ndarray:
     return enhanced
 
 
+def _adaptive_binary(img: np.ndarray) -> np.ndarray:
+    """적응형 이진화 (조명이 고르지 않은 라벨용)"""
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+    )
+
+
+def _large_enhanced(img: np.ndarray) -> np.ndarray:
+    """더 크게 확대한 버전 (작은 글씨용)"""
+    large_resized = resize_image(img, target_width=2500)
+    gray_large = cv2.cvtColor(large_resized, cv2.COLOR_BGR2GRAY)
+    # 강한 대비
+    clahe = cv2.createCLAHE(clipLimit=4.0, tileGridSize=(8, 8))
+    return clahe.apply(gray_large)
+
+
+def _xlarge_enhanced(img: np.ndarray) -> np.ndarray:
+    """매우 크게 확대 (3000px) - 작은 한글 텍스트용"""
+    xlarge = resize_image(img, target_width=3000)
+    gray_xl = cv2.cvtColor(xlarge, cv2.COLOR_BGR2GRAY)
+    # 언샤프 마스킹으로 글씨 선명하게
+    gaussian = cv2.GaussianBlur(gray_xl, (0, 0), 3)
+    unsharp = cv2.addWeighted(gray_xl, 1.5, gaussian, -0.5, 0)
+    # CLAHE
+    clahe_xl = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+    return clahe_xl.apply(unsharp)
+
+
+def _morph_closed(gray: np.ndarray) -> np.ndarray:
+    """이진화 + 모폴로지 (깨진 글씨 복원)"""
+    # Otsu 이진화
+    _, binary_morph = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # 닫힘 연산으로 끊어진 글씨 연결
+    kernel_close = np.ones((2, 2), np.uint8)
+    return cv2.morphologyEx(binary_morph, cv2.MORPH_CLOSE, kernel_close)
+
+
+def _bright_enhanced(img: np.ndarray) -> np.ndarray:
+    """밝기/대비 강화 버전"""
+    bright = adjust_brightness_contrast(img, brightness=40, contrast=40)
+    gray_bright = cv2.cvtColor(bright, cv2.COLOR_BGR2GRAY)
+    gray_bright = gamma_correction(gray_bright, gamma=1.5)
+    clahe_bright = cv2.createCLAHE(clipLimit=4.0, tileGridSize=(8, 8))
+    return clahe_bright.apply(gray_bright)
+
+
+def _dark_background(img: np.ndarray) -> np.ndarray:
+    """어두운 배경용 (영양성분표가 어두운 경우)"""
+    dark_bg = adjust_brightness_contrast(img, brightness=50, contrast=50)
+    gray_dark = cv2.cvtColor(dark_bg, cv2.COLOR_BGR2GRAY)
+    # 감마 더 높게
+    gray_dark = gamma_correction(gray_dark, gamma=2.0)
+    _, binary_dark = cv2.threshold(gray_dark, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary_dark
+
+
 def _tesseract_text(img: np.ndarray, lang: str, config: str = TESSERACT_CONFIG) -> str:
     """
     Tesseract 이미지 문자열 추출 헬퍼
@@ -150,6 +289,164 @@ def _tesseract_text(img: np.ndarray, lang: str, config: str = TESSERACT_CONFIG)
     return pytesseract.image_to_string(img, lang=lang, config=config)
 
 
+def warm_up(lang: str = TESSERACT_LANG) -> None:
+    """
+    서버 시작 시 작은 빈 이미지로 tesseract 를 한 번 실행
+    (실행 파일·언어 데이터를 디스크 캐시에 올려 첫 업로드 지연을 줄임)
+    """
+    blank = np.full((32, 32), 255, np.uint8)
+    try:
+        _tesseract_text(blank, lang)
+        logger.info("[OCR] Tesseract 예열 완료")
+    except Exception as e:
+        logger.warning("[OCR 예열 오류] %s", e)
+
+
+def _write_image_list(tmp_dir: str, images: List[np.ndarray]) -> str:
+    """
+    배치 OCR용 이미지 파일과 목록 파일 생성
+    Returns: 목록 파일 경로
+    """
+    paths = []
+    for i, img in enumerate(images):
+        # 무압축 PNM(PGM/PPM): PNG 압축·해제 없이 설정별 tesseract 가 바로 읽음 (임시 파일이라 크기는 상관없음)
+        path = os.path.join(tmp_dir, f"{i}.pnm")
+        # pytesseract 는 BGR 배열을 그대로 RGB 로 저장하므로 같은 파일이 되도록 채널 순서를 맞춤
+        if img.ndim == 3:
+            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        cv2.imwrite(path, img)
+        paths.append(path)
+
+    list_path = os.path.join(tmp_dir, "images.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(paths) + "\n")
+    return list_path
+
+
+def _tesseract_batch(list_path: str, count: int, lang: str, config: str) -> Optional[List[str]]:
+    """
+    목록 파일의 이미지들을 tesseract 한 번 실행으로 인식
+    Returns: 이미지별 텍스트 (실패하거나 페이지 수가 맞지 않으면 None)
+    """
+    try:
+        output = pytesseract.image_to_string(list_path, lang=lang, config=config)
+    except pytesseract.TesseractError as e:
+        logger.warning("[Tesseract 배치 오류 - %s] %s", config, e)
+        return None
+
+    pages = output.split(PAGE_SEPARATOR)
+    # 버전에 따라 마지막 페이지 뒤에도 구분자가 붙음
+    if len(pages) == count + 1 and not pages[-1].strip():
+        pages.pop()
+    if len(pages) != count:
+        logger.warning("[Tesseract 배치 오류 - %s] 페이지 수 불일치 (%s/%s)", config, len(pages), count)
+        return None
+    return pages
+
+
+def _run_batch_jobs(images: List[np.ndarray], jobs: tuple) -> List[Optional[List[str]]]:
+    """이미지들을 목록 파일 하나로 저장하고 설정별 tesseract 를 병렬 실행"""
+    with tempfile.TemporaryDirectory(prefix="tess_batch_") as tmp_dir:
+        list_path = _write_image_list(tmp_dir, images)
+        # 설정별 tesseract 실행을 단일 스레드 프로세스로 병렬 실행
+        return list(_OCR_POOL.map(
+            lambda job: _tesseract_batch(list_path, len(images), job[1], job[2]), jobs
+        ))
+
+
+def _run_batch_group(jobs: tuple, items: list) -> None:
+    """같은 설정의 요청들을 한 번에 실행하고 요청별로 결과를 나눠 줌 (_BATCH_RUN_POOL 에서 실행)"""
+    try:
+        results = _run_batch_jobs([img for images, _, _ in items for img in images], jobs)
+    except Exception as e:
+        for _, _, future in items:
+            future.set_exception(e)
+        return
+    offset = 0
+    for images, _, future in items:
+        end = offset + len(images)
+        future.set_result([pages[offset:end] if pages is not None else None for pages in results])
+        offset = end
+
+
+def _batch_worker() -> None:
+    """대기 중인 OCR 요청을 모아 같은 설정끼리 묶어 _BATCH_RUN_POOL 에 맡김"""
+    running: List[Future] = []
+    while True:
+        pending = [_BATCH_QUEUE.get()]
+        running = [f for f in running if not f.done()]
+        # tesseract 가 놀고 있고 다른 요청도 없으면 기다리지 않고 바로 실행
+        if running or not _BATCH_QUEUE.empty():
+            deadline = time.monotonic() + OCR_BATCH_WINDOW_MS / 1000
+            while len(pending) < OCR_BATCH_MAX:
+                try:
+                    pending.append(_BATCH_QUEUE.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+
+        groups = {}
+        for item in pending:
+            groups.setdefault(item[1], []).append(item)
+        for jobs, items in groups.items():
+            running.append(_BATCH_RUN_POOL.submit(_run_batch_group, jobs, items))
+
+
+def _batch_ocr(images: List[np.ndarray], jobs: list) -> List[Optional[List[str]]]:
+    """
+    배치 OCR 요청 (다른 업로드와 합쳐 실행될 수 있음)
+    Returns: 설정별 이미지 텍스트 목록 (실패한 설정은 None)
+    """
+    global _batch_thread
+    with _BATCH_THREAD_LOCK:
+        if _batch_thread is None:
+            _batch_thread = threading.Thread(target=_batch_worker, name="ocr-batch", daemon=True)
+            _batch_thread.start()
+    future: Future = Future()
+    _BATCH_QUEUE.put((images, tuple(jobs), future))
+    return future.result()
+
+
+def _variant_text(variant: tuple, job: tuple) -> Optional[str]:
+    """변형 이미지 하나를 설정 하나로 인식 (실패하면 None)"""
+    variant_name, img = variant
+    config_name, job_lang, config, suffix = job
+    try:
+        return _tesseract_text(img, job_lang, config)
+    except pytesseract.TesseractError as e:
+        logger.warning("[Tesseract 오류 - %s/%s%s] %s", variant_name, config_name, suffix, e)
+        return None
+
+
+def _confident_text(img: np.ndarray, lang: str) -> Optional[str]:
+    """
+    빠른 모드용 기본 인식 (PSM 6 한 번)
+    Returns: 단어 평균 신뢰도가 OCR_FAST_MIN_CONF 이상이면 줄 단위 텍스트, 아니면 None
+    """
+    try:
+        data = pytesseract.image_to_data(
+            img, lang=lang, config=TESSERACT_CONFIG, output_type=Output.DICT
+        )
+    except pytesseract.TesseractError as e:
+        logger.warning("[Tesseract 오류 - 빠른 모드] %s", e)
+        return None
+
+    lines = {}
+    confs = []
+    for i, word in enumerate(data["text"]):
+        word = word.strip()
+        conf = float(data["conf"][i])
+        if not word or conf < 0:
+            continue
+        confs.append(conf)
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(key, []).append(word)
+
+    if not confs or sum(confs) / len(confs) < OCR_FAST_MIN_CONF:
+        return None
+    # 전체 모드와 같이 중복 줄 제거
+    return "\n".join(dict.fromkeys(" ".join(words) for words in lines.values()))
+
+
 def run_ocr(image_path: str, lang: str = TESSERACT_LANG) -> str:
     """
     강화된 OCR 실행
@@ -160,110 +457,59 @@ def run_ocr(image_path: str, lang: str = TESSERACT_LANG) -> str:
     if not image_path.exists():
         raise FileNotFoundError(f"이미지를 찾을 수 없음: {image_path}")
 
-    original = cv2.imread(str(image_path))
-    if original is None:
-        raise FileNotFoundError(f"이미지를 찾을 수 없음: {image_path}")
+    # 한 번만 디코딩해 모든 전처리에서 같이 씀 (전처리 함수들은 입력 배열을 바꾸지 않으므로 복사 불필요)
+    original = _read_image(str(image_path))
 
     all_texts = []
-    variants = []
-
-    variants.append(("원본", original))
 
+    # 기본 폭(1800px) 확대는 전처리/반전/적응형 이진화가 함께 씀
+    # (resize_image 는 이미 목표 폭 이상이면 그대로 돌려주므로 함수 안의 리사이즈는 생략됨)
     try:
-        variants.append(("전처리", preprocess_image(str(image_path))))
+        resized = resize_image(original)
     except Exception as e:
-        print(f"[OCR 전처리 오류] {e}")
+        logger.warning("[OCR 확대 오류] %s", e)
+        resized = None
 
-    try:
-        variants.append(("표 전처리", preprocess_for_table(str(image_path))))
-    except Exception as e:
-        print(f"[OCR 표 전처리 오류] {e}")
+    # 기본 전처리를 먼저 시작 (빠른 모드는 이 결과만으로 끝날 수 있음)
+    first = _PREPROCESS_POOL.submit(preprocess_image, resized)
 
-    try:
-        variants.append(("반전", preprocess_invert(str(image_path))))
-    except Exception as e:
-        print(f"[OCR 반전 오류] {e}")
+    # 빠른 모드: 기본 인식이 충분히 확실하면 나머지 변형·설정은 만들지도 실행하지도 않음
+    if OCR_MODE == "fast" and first.exception() is None:
+        text = _confident_text(first.result(), lang)
+        if text is not None:
+            return text
 
+    # 2000px 변형들이 함께 쓰는 확대 이미지와 그레이스케일 (한 번만 계산)
     try:
-        resized = resize_image(original.copy())
-        gray = cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY)
-        binary = cv2.adaptiveThreshold(
-            gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-        )
-        variants.append(("적응형 이진화", binary))
+        resized_2k = resize_image(original, target_width=2000)
+        gray_2k = cv2.cvtColor(resized_2k, cv2.COLOR_BGR2GRAY)
     except Exception as e:
-        print(f"[OCR 이진화 오류] {e}")
+        logger.warning("[OCR 2000px 확대 오류] %s", e)
+        resized_2k = gray_2k = None
+
+    # (변형 이름, 생성 함수, 입력 이미지, 오류 표시 이름) - 이 순서대로 결과를 모음
+    builders = [
+        ("전처리", None, resized, "전처리"),  # 위에서 이미 시작
+        ("표 전처리", preprocess_for_table, original, "표 전처리"),
+        ("반전", preprocess_invert, resized, "반전"),
+        ("적응형 이진화", _adaptive_binary, resized, "이진화"),
+        ("대형 확대", _large_enhanced, original, "대형 확대"),
+        ("초대형 확대", _xlarge_enhanced, original, "초대형 확대"),
+        ("모폴로지", _morph_closed, gray_2k, "모폴로지"),
+        ("히스토그램 평활화", cv2.equalizeHist, gray_2k, "히스토그램 평활화"),
+        ("밝기강화", _bright_enhanced, resized_2k, "밝기강화"),
+        ("어두운배경용", _dark_background, resized_2k, "어두운배경용"),
+    ]
 
-    # 추가: 더 크게 확대한 버전 (작은 글씨용)
-    try:
-        large_resized = resize_image(original.copy(), target_width=2500)
-        gray_large = cv2.cvtColor(large_resized, cv2.COLOR_BGR2GRAY)
-        # 강한 대비
-        clahe = cv2.createCLAHE(clipLimit=4.0, tileGridSize=(8, 8))
-        enhanced_large = clahe.apply(gray_large)
-        variants.append(("대형 확대", enhanced_large))
-    except Exception as e:
-        print(f"[OCR 대형 확대 오류] {e}")
-    
-    # 추가: 매우 크게 확대 (3000px) - 작은 한글 텍스트용
-    try:
-        xlarge = resize_image(original.copy(), target_width=3000)
-        gray_xl = cv2.cvtColor(xlarge, cv2.COLOR_BGR2GRAY)
-        # 언샤프 마스킹으로 글씨 선명하게
-        gaussian = cv2.GaussianBlur(gray_xl, (0, 0), 3)
-        unsharp = cv2.addWeighted(gray_xl, 1.5, gaussian, -0.5, 0)
-        # CLAHE
-        clahe_xl = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-        enhanced_xl = clahe_xl.apply(unsharp)
-        variants.append(("초대형 확대", enhanced_xl))
-    except Exception as e:
-        print(f"[OCR 초대형 확대 오류] {e}")
-    
-    # 추가: 이진화 + 모폴로지 (깨진 글씨 복원)
-    try:
-        resized_morph = resize_image(original.copy(), target_width=2000)
-        gray_morph = cv2.cvtColor(resized_morph, cv2.COLOR_BGR2GRAY)
-        # Otsu 이진화
-        _, binary_morph = cv2.threshold(gray_morph, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        # 닫힘 연산으로 끊어진 글씨 연결
-        kernel_close = np.ones((2, 2), np.uint8)
-        closed = cv2.morphologyEx(binary_morph, cv2.MORPH_CLOSE, kernel_close)
-        variants.append(("모폴로지", closed))
-    except Exception as e:
-        print(f"[OCR 모폴로지 오류] {e}")
-    
-    # 추가: 히스토그램 평활화 (밝기 균일화)
-    try:
-        resized_eq = resize_image(original.copy(), target_width=2000)
-        gray_eq = cv2.cvtColor(resized_eq, cv2.COLOR_BGR2GRAY)
-        equalized = cv2.equalizeHist(gray_eq)
-        variants.append(("히스토그램 평활화", equalized))
-    except Exception as e:
-        print(f"[OCR 히스토그램 평활화 오류] {e}")
-    
-    # 추가: 밝기/대비 강화 버전
-    try:
-        bright = resize_image(original.copy(), target_width=2000)
-        bright = adjust_brightness_contrast(bright, brightness=40, contrast=40)
-        gray_bright = cv2.cvtColor(bright, cv2.COLOR_BGR2GRAY)
-        gray_bright = gamma_correction(gray_bright, gamma=1.5)
-        clahe_bright = cv2.createCLAHE(clipLimit=4.0, tileGridSize=(8, 8))
-        enhanced_bright = clahe_bright.apply(gray_bright)
-        variants.append(("밝기강화", enhanced_bright))
-    except Exception as e:
-        print(f"[OCR 밝기강화 오류] {e}")
-    
-    # 추가: 어두운 배경용 (영양성분표가 어두운 경우)
-    try:
-        dark_bg = resize_image(original.copy(), target_width=2000)
-        dark_bg = adjust_brightness_contrast(dark_bg, brightness=50, contrast=50)
-        gray_dark = cv2.cvtColor(dark_bg, cv2.COLOR_BGR2GRAY)
-        # 감마 더 높게
-        gray_dark = gamma_correction(gray_dark, gamma=2.0)
-        _, binary_dark = cv2.threshold(gray_dark, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        variants.append(("어두운배경용", binary_dark))
-    except Exception as e:
-        print(f"[OCR 어두운배경용 오류] {e}")
+    # 나머지 변형은 OpenCV 가 GIL 을 놓는 동안 여러 코어에서 동시에 생성
+    futures = [first] + [_PREPROCESS_POOL.submit(build, img) for _, build, img, _ in builders[1:]]
+
+    variants = [("원본", original)]
+    for (name, _, _, label), future in zip(builders, futures):
+        try:
+            variants.append((name, future.result()))
+        except Exception as e:
+            logger.warning("[OCR %s 오류] %s", label, e)
 
     # 여러 PSM 모드로 OCR 시도 (글자 분리 최소화)
     configs = [
@@ -282,38 +528,32 @@ def run_ocr(image_path: str, lang: str = TESSERACT_LANG) -> str:
         ("한글열", "--oem 3 --psm 4"),
     ]
     
-    for variant_name, img in variants:
-        if img is None:
-            continue
-        # 표준 설정으로 OCR
-        for config_name, config in configs:
-            try:
-                text = _tesseract_text(img, lang, config)
-                if text:
-                    all_texts.extend(text.splitlines())
-            except pytesseract.TesseractError as e:
-                print(f"[Tesseract 오류 - {variant_name}/{config_name}] {e}")
-        
-        # 한글 전용 OCR (더 정확한 한글 인식)
-        for config_name, config in kor_configs:
-            try:
-                text = _tesseract_text(img, "kor", config)  # 한글만
-                if text:
-                    all_texts.extend(text.splitlines())
-            except pytesseract.TesseractError as e:
-                print(f"[Tesseract 오류 - {variant_name}/{config_name}/kor] {e}")
-
-    # 중복 제거 및 정리
-    seen = set()
-    unique_texts = []
-    for text in all_texts:
-        cleaned = text.strip()
-        # 너무 짧거나 특수문자만 있는 건 제외
-        if cleaned and len(cleaned) >= 1 and cleaned not in seen:
-            seen.add(cleaned)
-            unique_texts.append(cleaned)
-    
-    return "\n".join(unique_texts)
+    # (표시 이름, 언어, 설정, 오류 표시용 접미사) - 한글 전용 설정은 "kor" 로 실행
+    jobs = [(name, lang, config, "") for name, config in configs]
+    jobs += [(name, "kor", config, "/kor") for name, config in kor_configs]
+
+    variants = [(name, img) for name, img in variants if img is not None]
+
+    # 설정별 배치 결과: batch_texts[job][variant]
+    batch_texts = [None] * len(jobs)
+    if TESSERACT_BATCH and len(variants) > 1:
+        batch_texts = _batch_ocr([img for _, img in variants], jobs)
+
+    # 배치 실패분(또는 배치 미사용)은 이미지별 실행을 풀에서 병렬로 다시 시도
+    retry = [(v, j) for j in range(len(jobs)) if batch_texts[j] is None for v in range(len(variants))]
+    retry_texts = dict(zip(retry, _OCR_POOL.map(
+        lambda vj: _variant_text(variants[vj[0]], jobs[vj[1]]), retry
+    )))
+
+    # 원래 순서(변형 → 설정)대로 결과 모음
+    for v in range(len(variants)):
+        for j in range(len(jobs)):
+            text = batch_texts[j][v] if batch_texts[j] is not None else retry_texts[(v, j)]
+            if text:
+                all_texts.extend(text.splitlines())
+
+    # 중복 제거 및 정리 (앞뒤 공백 제거 후 빈 줄 제외, 처음 나온 순서 유지)
+    return "\n".join(dict.fromkeys(filter(None, map(str.strip, all_texts))))
 
 
 def run_ocr_with_confidence(image_path: str, lang: str = TESSERACT_LANG) -> list:
@@ -337,19 +577,14 @@ def run_ocr_with_confidence(image_path: str, lang: str = TESSERACT_LANG) -> list
         raise RuntimeError(f"Tesseract 실행 실패: {e}") from e
 
     results = []
-    n_items = len(data["text"])
-    for i in range(n_items):
-        text = data["text"][i].strip()
-        conf = data["conf"][i]
+    # 열(list)들을 zip 으로 한 번에 순회 (항목마다 dict 인덱싱 6번 생략)
+    for text, conf, x, y, w, h in zip(
+        data["text"], data["conf"], data["left"], data["top"], data["width"], data["height"]
+    ):
+        text = text.strip()
         if not text or conf == "-1":
             continue
 
-        x, y, w, h = (
-            data["left"][i],
-            data["top"][i],
-            data["width"][i],
-            data["height"][i],
-        )
         bbox = [
             [x, y],
             [x + w, y],
@@ -0,0 +1,16 @@
+"""
+WSGI 진입점 (운영용)
+
+    cd server
+    gunicorn -b 0.0.0.0:5000 -k gthread -w 1 --threads 8 --timeout 120 wsgi:app
+
+OCR 은 tesseract 서브프로세스로 돌아 GIL 을 잡지 않으므로 스레드 워커로 충분함.
+비동기 업로드 진행 상태는 프로세스 메모리에 있으므로 워커 프로세스는 1개로 둠.
+"""
+import threading
+
+from app import app, OCR_LANG
+from ocr_utils import warm_up
+
+# 첫 업로드가 Tesseract 콜드 스타트를 떠안지 않도록 백그라운드에서 미리 실행
+threading.Thread(target=warm_up, args=(OCR_LANG,), daemon=True).start()